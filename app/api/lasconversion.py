@@ -2,52 +2,298 @@
 API endpoint for converting LAS/LAZ files to images.
 """
 import os
-import sys
 import subprocess
 import json
 import tempfile
 import shutil
 import logging
+import zipfile
+import fnmatch
+import time
+import mimetypes
+from urllib.parse import quote
+from threading import Thread
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
+import numpy as np
+import piexif
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.warp import transform
 from django.conf import settings
-from django.http import FileResponse, JsonResponse
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.http import FileResponse, HttpResponse
 from rest_framework.views import APIView
 from rest_framework import status, exceptions, permissions
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.utils.translation import gettext_lazy as _
+from zipstream.ng import ZipStream
+
+from app.scripts import las_to_images
+from app.scripts.las_to_images import create_multiview_images, create_perspective_views, rasterize_pointcloud, rasterize_pointcloud_modes, gdal_config_options, available_cpus
+from app.uploadhandler import TemporaryFileUploadHandler
+from .tasks import download_file_stream
 
 logger = logging.getLogger('app.logger')
 
+# Larger GDAL block cache so tiled/compressed TIFs are not
+# decompressed more than once while being translated. Only applied
+# to conversions (see gdal_translate), never to the whole web process
+GDAL_CACHEMAX = "25%"
+
+# tmpfs used to stage conversions when there's enough room (see get_las_tmp_dir)
+FAST_TMP_DIR = "/dev/shm"
+FAST_TMP_MIN_FREE = 4 * 1024 ** 3
+
+# Conversions older than this (in seconds) are deleted
+LAS_TMP_MAX_AGE = 60 * 60 * 24
+
+# Conversions staged in FAST_TMP_DIR hold RAM, so they're deleted much sooner
+FAST_TMP_MAX_AGE = 60 * 60
+
+# nginx internal locations serving each staging area (see USE_X_ACCEL_REDIRECT)
+X_ACCEL_LOCATIONS = {
+    FAST_TMP_DIR: '/internal-las-convert/shm/',
+    settings.MEDIA_TMP: '/internal-las-convert/media-tmp/',
+}
+
+# Uploaded point clouds are read from the request body in chunks of this size
+LAS_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Write buffer for ZIP archives; zipfile copies members in 8 KiB chunks
+ZIP_WRITE_BUFFER_SIZE = 8 * 1024 * 1024
 
+# Float TIFs are read at 1/N of their width and height to pick a scaling range
+PERCENTILE_DECIMATION = 16
+
+# Prefer the in-process GDAL bindings over spawning gdal_translate
+# for every file; fall back to the command line tools if unavailable
+try:
+    from osgeo import gdal
+    gdal.UseExceptions()
+    gdal.AllRegister()
+    USE_GDAL_BINDINGS = True
+except ImportError:
+    USE_GDAL_BINDINGS = False
+
+
+@lru_cache(maxsize=1)
 def check_pdal():
-    """Check if PDAL is installed and available."""
-    try:
-        subprocess.run(["pdal", "--version"], capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    """Check if PDAL is installed and available (Python bindings or command line tool)."""
+    return las_to_images.check_pdal()
+
+
+@lru_cache(maxsize=1)
+def gdal_translate_path():
+    """Path to the gdal_translate executable, or None."""
+    return shutil.which('gdal_translate')
 
 
 def check_gdal():
     """Check if GDAL tools are available."""
-    gdal_translate = shutil.which('gdal_translate')
-    return gdal_translate is not None
+    return gdal_translate_path() is not None
+
+
+def clear_tool_cache():
+    """Forget cached check_pdal() / gdal_translate_path() results."""
+    check_pdal.cache_clear()
+    gdal_translate_path.cache_clear()
+
 
+def gdal_translate(src, dst, args):
+    """
+    Run a gdal_translate conversion from src to dst.
+
+    :param src: input path, or an already open gdal.Dataset when using the bindings
+    :param args: gdal_translate command line options (without input/output paths)
+    :return: diagnostic output produced by gdal_translate (may be empty)
+    :raises RuntimeError: if the conversion fails
+    """
+    if USE_GDAL_BINDINGS:
+        # Scoped to this thread and call: the bindings share the process with the
+        # rest of the web app. GDAL sizes its block cache on first use, so this
+        # doesn't grow a cache that something else already set up
+        with gdal_config_options({'GDAL_CACHEMAX': GDAL_CACHEMAX}):
+            ds = gdal.Translate(str(dst), src if isinstance(src, gdal.Dataset) else str(src), options=args)
+        if ds is None:
+            raise RuntimeError(gdal.GetLastErrorMsg())
+        ds = None # Close and flush to disk
+        return ""
 
-def get_las_info(las_file):
-    """Get information about the LAS file using PDAL."""
+    cmd = [gdal_translate_path(), "--config", "GDAL_CACHEMAX", GDAL_CACHEMAX] + args + [str(src), str(dst)]
     try:
-        result = subprocess.run(
-            ["pdal", "info", "--summary", str(las_file)],
-            capture_output=True,
-            check=True,
-            text=True
-        )
-        return json.loads(result.stdout).get('summary', {})
-    except Exception as e:
-        logger.error(f"Could not read LAS file info: {e}")
-        return None
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, text=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr if e.stderr else str(e))
+    return result.stderr
+
+
+def find_files(directory, patterns, first_match=True):
+    """
+    List the files of a directory (non recursive) whose names match
+    glob-style patterns, scanning the directory only once.
+
+    :param patterns: list of fnmatch patterns (case sensitive, like Path.glob)
+    :param first_match: return only the files matching the first pattern that
+        matches anything, instead of the files matching any pattern
+    :return: list of Path objects
+    """
+    try:
+        with os.scandir(directory) as it:
+            names = [entry.name for entry in it if entry.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+
+    if not first_match:
+        return [Path(directory) / n for n in names if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+
+    for pattern in patterns:
+        matches = [n for n in names if fnmatch.fnmatchcase(n, pattern)]
+        if matches:
+            return [Path(directory) / n for n in matches]
+    return []
+
+
+def get_las_tmp_dir(required_bytes=0):
+    """
+    Directory in which to stage LAS conversions. Prefers a tmpfs (/dev/shm)
+    so that PDAL/GDAL reads and writes skip the block layer, as long as it
+    can hold the conversion comfortably.
+
+    :param required_bytes: size of the point cloud that will be staged
+    """
+    if settings.LAS_TMP_DIR:
+        os.makedirs(settings.LAS_TMP_DIR, exist_ok=True)
+        return settings.LAS_TMP_DIR
+
+    try:
+        if os.path.ismount(FAST_TMP_DIR) and \
+            shutil.disk_usage(FAST_TMP_DIR).free > FAST_TMP_MIN_FREE + 2 * required_bytes:
+            return FAST_TMP_DIR
+    except OSError:
+        pass
+
+    return settings.MEDIA_TMP
+
+
+def rmtree_async(path):
+    """Delete a directory tree from a background thread."""
+    Thread(target=shutil.rmtree, args=(path,), kwargs={'ignore_errors': True}, daemon=True).start()
+
+
+def cleanup_las_tmp_dirs(max_age=LAS_TMP_MAX_AGE):
+    """
+    Delete conversion directories (and orphaned uploads) older than max_age seconds,
+    or FAST_TMP_MAX_AGE seconds in FAST_TMP_DIR.
+    MEDIA_TMP is already cleaned up by the worker (cleanup_tmp_directory),
+    but a tmpfs staging area is local to the web process' container.
+    """
+    now = time.time()
+    for base_dir in set(filter(None, (settings.LAS_TMP_DIR, FAST_TMP_DIR))):
+        base_max_age = min(max_age, FAST_TMP_MAX_AGE) if base_dir == FAST_TMP_DIR else max_age
+        try:
+            with os.scandir(base_dir) as it:
+                for entry in it:
+                    if entry.name.startswith('las_conv_') and \
+                        entry.stat(follow_symlinks=False).st_mtime < now - base_max_age:
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path, ignore_errors=True)
+                        else:
+                            os.unlink(entry.path)
+                        logger.info(f"Cleaned up: {entry.path}")
+        except OSError:
+            pass
+
+
+def cleanup_las_tmp_dirs_async():
+    """Run cleanup_las_tmp_dirs() from a background thread."""
+    Thread(target=cleanup_las_tmp_dirs, daemon=True).start()
+
+
+def is_las_file(path):
+    """
+    Check the file signature of a LAS/LAZ file
+    (both start with the "LASF" magic bytes).
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(4) == b'LASF'
+    except OSError:
+        return False
+
+
+def write_chunks(destination, chunks, batch_size=16):
+    """
+    Write an iterable of bytes chunks to an open binary file,
+    gathering them into os.writev() calls where supported.
+    """
+    if not hasattr(os, 'writev'):
+        for chunk in chunks:
+            destination.write(chunk)
+        return
+
+    destination.flush()
+    fd = destination.fileno()
+
+    def flush(batch):
+        written = os.writev(fd, batch)
+        remaining = sum(len(b) for b in batch) - written
+        if remaining > 0:
+            # Partial write, finish off the tail
+            tail = memoryview(b"".join(batch))[written:]
+            while len(tail) > 0:
+                tail = tail[os.write(fd, tail):]
+
+    batch = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+
+def rasterize_modes(las_file, output_dir, resolution, modes):
+    """
+    Rasterize a point cloud in several modes. Single band modes share one
+    pipeline (see rasterize_pointcloud_modes), so the point cloud is decoded
+    once for all of them; RGB stacks three bands and gets its own pipeline.
+
+    Returns tuple: (success: bool, output_files: list, error: str)
+    """
+    base_name = las_file.stem
+    outputs = {m: output_dir / f"{base_name}_{m}_{resolution}m.tif" for m in modes}
+    output_files = []
+    errors = []
+
+    runs = []
+    single_band = {m: f for m, f in outputs.items() if m != 'rgb'}
+    if single_band:
+        runs.append((single_band, lambda: rasterize_pointcloud_modes(las_file, single_band, resolution)))
+    if 'rgb' in outputs:
+        runs.append(({'rgb': outputs['rgb']}, lambda: rasterize_pointcloud(las_file, outputs['rgb'], resolution, 'rgb')))
+
+    for run_outputs, run in runs:
+        try:
+            success, error = run()
+        except Exception as e:
+            success, error = False, str(e)
+
+        if success:
+            output_files.extend(str(f) for f in run_outputs.values())
+        else:
+            error_msg = error if error else "Failed to rasterize point cloud"
+            run_modes = ", ".join(run_outputs)
+            logger.error(f"Rasterization failed for {run_modes} mode: {error_msg}")
+            errors.append(f"{run_modes}: {error_msg}")
+
+    if len(output_files) == 0:
+        return False, [], ", ".join(errors)
+    return True, sorted(output_files), None
 
 
 def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb', 
@@ -57,33 +303,6 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb',
     
     Returns tuple: (success: bool, output_files: list, error: str)
     """
-    # Import conversion functions dynamically
-    import importlib.util
-    import sys
-    
-    # Get the script path
-    from django.conf import settings
-    base_dir = getattr(settings, 'BASE_DIR', os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    script_path = os.path.join(base_dir, 'app', 'scripts', 'las_to_images.py')
-    
-    if not os.path.exists(script_path):
-        return False, [], f"Conversion script not found at {script_path}"
-    
-    spec = importlib.util.spec_from_file_location("las_to_images_module", script_path)
-    if spec is None or spec.loader is None:
-        return False, [], "Could not load conversion script"
-    
-    las_module = importlib.util.module_from_spec(spec)
-    sys.modules['las_to_images_module'] = las_module
-    spec.loader.exec_module(las_module)
-    
-    create_multiview_images = getattr(las_module, 'create_multiview_images', None)
-    create_perspective_views = getattr(las_module, 'create_perspective_views', None)
-    rasterize_pointcloud = getattr(las_module, 'rasterize_pointcloud', None)
-    
-    if not create_multiview_images or not rasterize_pointcloud:
-        return False, [], "Required functions not found in conversion script"
-    
     las_file = Path(las_file)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -94,27 +313,18 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb',
     if not las_file.suffix.lower() in ['.las', '.laz']:
         return False, [], "Input file must be .las or .laz"
     
+    # Several modes can be requested at once, e.g. "rgb,intensity,elevation"
+    modes = [m.strip() for m in mode.split(',') if m.strip()]
+    if len(modes) > 1 and (multiview or use_perspective):
+        return False, [], "Multiple modes are only supported for single image conversion"
+    
     try:
         if use_perspective:
             # Use perspective views (azimuth/elevation angles)
-            import io
-            import contextlib
-            
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            
             try:
-                with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
-                    success = create_perspective_views(
-                        las_file, output_dir, resolution, mode, count
-                    )
-                stdout_output = stdout_capture.getvalue()
-                stderr_output = stderr_capture.getvalue()
-                
-                if stdout_output:
-                    logger.info(f"Perspective view conversion output: {stdout_output}")
-                if stderr_output:
-                    logger.warning(f"Perspective view conversion errors: {stderr_output}")
+                success = create_perspective_views(
+                    las_file, output_dir, resolution, mode, count
+                )
                 
                 # Find output files with view pattern
                 patterns = [
@@ -122,45 +332,20 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb',
                     f"*{mode}*view*.tif",
                     "*.tif"
                 ]
-                output_files = []
-                for pattern in patterns:
-                    files = list(output_dir.glob(pattern))
-                    if files:
-                        output_files = files
-                        break
+                output_files = find_files(output_dir, patterns)
                 
                 if output_files:
                     return True, [str(f) for f in output_files], None
                 elif not success:
-                    error_msg = "Failed to create perspective views"
-                    if "ERROR:" in stdout_output:
-                        error_msg += f": {stdout_output}"
-                    return False, [], error_msg
+                    return False, [], "Failed to create perspective views (see the application log for details)"
             except Exception as e:
                 logger.error(f"Exception during perspective view conversion: {e}", exc_info=True)
                 return False, [], f"Exception during perspective view conversion: {str(e)}"
         elif multiview:
-            # Capture stdout/stderr to see print() messages
-            import io
-            import contextlib
-            
-            # Redirect stdout to capture print() messages
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            
             try:
-                with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
-                    success = create_multiview_images(
-                        las_file, output_dir, resolution, mode, tile_size, overlap, count
-                    )
-                stdout_output = stdout_capture.getvalue()
-                stderr_output = stderr_capture.getvalue()
-                
-                # Log captured output for debugging
-                if stdout_output:
-                    logger.info(f"Multiview conversion output: {stdout_output}")
-                if stderr_output:
-                    logger.warning(f"Multiview conversion errors: {stderr_output}")
+                success = create_multiview_images(
+                    las_file, output_dir, resolution, mode, tile_size, overlap, count
+                )
                 
                 # Check if files were actually created even if function returned False
                 # Pattern matches: {base_name}_{mode}_tile_r{row}_c{col}.tif
@@ -171,31 +356,20 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb',
                     "*_tile_*.tif",  # Generic tile pattern
                     "*.tif"  # All TIF files as fallback
                 ]
-                output_files = []
-                for pattern in patterns:
-                    files = list(output_dir.glob(pattern))
-                    if files:
-                        output_files = files
-                        break
+                output_files = find_files(output_dir, patterns)
                 
                 if output_files:
                     # Files were created, return success even if function returned False
                     logger.info(f"Found {len(output_files)} output files despite function return value")
                     return True, [str(f) for f in output_files], None
                 elif not success:
-                    # No files and function returned False - provide detailed error
-                    error_msg = "Failed to create multiview images"
-                    if stdout_output:
-                        # Extract error messages from output
-                        if "ERROR:" in stdout_output:
-                            error_msg += f": {stdout_output}"
-                        elif "Could not read" in stdout_output:
-                            error_msg += ": " + stdout_output.split("ERROR:")[-1].strip()
-                    return False, [], error_msg
+                    return False, [], "Failed to create multiview images (see the application log for details)"
             except Exception as e:
                 # Capture any exceptions during conversion
                 logger.error(f"Exception during multiview conversion: {e}", exc_info=True)
                 return False, [], f"Exception during multiview conversion: {str(e)}"
+        elif len(modes) > 1:
+            return rasterize_modes(las_file, output_dir, resolution, modes)
         else:
             base_name = las_file.stem
             output_file = output_dir / f"{base_name}_{mode}_{resolution}m.tif"
@@ -206,17 +380,9 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='rgb',
                 return False, [], error_msg
             return True, [str(output_file)], None
         
-        # Get list of created files (fallback for multiview)
-        if multiview:
-            pattern = "*view*.tif" if mode == 'rgb' else f"*{mode}*tile*.tif"
-        else:
-            pattern = f"*{mode}*.tif"
-        
-        output_files = list(output_dir.glob(pattern))
-        if output_files:
-            return True, [str(f) for f in output_files], None
-        else:
-            return False, [], "No output files were created"
+        # The scans above already fall back to "*.tif", so there is
+        # no point in listing the output directory again
+        return False, [], "No output files were created"
         
     except Exception as e:
         logger.error(f"LAS conversion error: {e}", exc_info=True)
@@ -234,9 +400,6 @@ def add_gps_exif_to_jpg(jpg_path, lat, lon, alt=None):
         alt: Altitude in meters (optional)
     """
     try:
-        import piexif
-        from PIL import Image
-        
         # Load existing EXIF or create new
         try:
             exif_dict = piexif.load(str(jpg_path))
@@ -265,10 +428,8 @@ def add_gps_exif_to_jpg(jpg_path, lat, lon, alt=None):
         
         exif_dict["GPS"] = gps_ifd
         
-        # Save with EXIF
-        img = Image.open(str(jpg_path))
-        exif_bytes = piexif.dump(exif_dict)
-        img.save(str(jpg_path), exif=exif_bytes, quality=95)
+        # Splice the EXIF segment into the file without re-encoding the image
+        piexif.insert(piexif.dump(exif_dict), str(jpg_path))
         return True
     except Exception as e:
         logger.warning(f"Failed to add GPS EXIF to {jpg_path}: {e}")
@@ -282,9 +443,6 @@ def get_geotiff_center_coords(tif_path):
     Returns: (lat, lon, alt) or None if georeferencing not available
     """
     try:
-        import rasterio
-        from rasterio.warp import transform
-        
         with rasterio.open(str(tif_path)) as src:
             # Get bounds in source CRS
             bounds = src.bounds
@@ -325,270 +483,288 @@ def get_geotiff_center_coords(tif_path):
         return None
 
 
-def convert_tifs_to_jpgs(input_dir, output_dir):
+def get_tif_info(tif_file):
+    """
+    Band layout and exact minimum/maximum of a TIF, as reported by gdalinfo -json -mm.
+    The range is computed by GDAL itself, without reading pixels into Python. It drives
+    the scaling of integer rasters, so it isn't subsampled (that can miss the brightest
+    pixels and clip highlights). Nothing is saved to .aux.xml sidecars next to the TIF.
+
+    :param tif_file: path, or an already open gdal.Dataset when using the bindings
+    """
+    if USE_GDAL_BINDINGS:
+        src = tif_file if isinstance(tif_file, gdal.Dataset) else str(tif_file)
+        with gdal_config_options({'GDAL_PAM_ENABLED': 'NO'}):
+            return gdal.Info(src, format='json', computeMinMax=True)
+
+    result = subprocess.run(["gdalinfo", "-json", "-mm", "--config", "GDAL_PAM_ENABLED", "NO", str(tif_file)],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    return json.loads(result.stdout)
+
+
+def get_band_range(bands):
+    """
+    Overall (min, max) of the bands in a gdalinfo -json -mm report,
+    or None if GDAL found no valid pixels.
+    """
+    minimums = [b['computedMin'] for b in bands if 'computedMin' in b]
+    maximums = [b['computedMax'] for b in bands if 'computedMax' in b]
+    if len(minimums) == 0 or len(maximums) == 0:
+        return None
+    return int(min(minimums)), int(max(maximums))
+
+
+def get_percentile_range(tif_file, indexes=None):
+    """
+    Robust scaling range of a float TIF, using the 2nd and 98th percentiles
+    unless they cover too little of the full range.
+
+    :param indexes: band index (or list of indexes) to read, all bands if None
+    :return: (min_val, max_val, abs_min, abs_max) or None if there's no valid data
+    """
+    with rasterio.open(str(tif_file)) as src:
+        # p2/p98 are robust statistics, so a decimated read is enough.
+        # Nearest neighbour keeps the sampled values (and nodata) intact;
+        # GDAL serves the read from overviews when the file has them
+        height = max(1, src.height // PERCENTILE_DECIMATION)
+        width = max(1, src.width // PERCENTILE_DECIMATION)
+        if isinstance(indexes, int):
+            out_shape = (height, width)
+        else:
+            out_shape = (len(indexes) if indexes is not None else src.count, height, width)
+        # float32 is plenty to pick a scaling range, and halves the bytes
+        # masked and partitioned below for Float64 rasters
+        data = src.read(indexes, out_shape=out_shape, out_dtype=np.float32, resampling=Resampling.nearest)
+        # Handle nodata (NaN/inf are never valid, even when nodata is set)
+        valid = np.isfinite(data)
+        if src.nodata is not None:
+            valid &= data != src.nodata
+        data_valid = data[valid]
+
+    if len(data_valid) == 0:
+        return None
+
+    # Use 2nd and 98th percentile for more robust scaling; the extremes
+    # come out of the same selection instead of separate min()/max() passes
+    abs_min, p2, p98, abs_max = (float(p) for p in np.percentile(data_valid, [0, 2, 98, 100]))
+
+    # Use percentiles if they provide better range, otherwise use absolute min/max
+    if p98 > p2 and (p98 - p2) > (abs_max - abs_min) * 0.1:
+        return p2, p98, abs_min, abs_max
+    return abs_min, abs_max, abs_min, abs_max
+
+
+def convert_tif_to_jpg(tif_file, output_dir):
+    """
+    Convert a single TIF file to JPEG format.
+
+    Returns tuple: (jpg_file: str or None, error: str or None)
+    """
+    jpg_file = output_dir / f"{tif_file.stem}.jpg"
+    try:
+        # Check if file is readable first
+        if not os.path.exists(tif_file) or os.path.getsize(tif_file) == 0:
+            return None, f"{tif_file.name}: File is empty or missing"
+
+        # Convert TIF to JPG with proper handling for different data types
+        # For single-band (grayscale), convert to RGB
+        # For float data, scale to 8-bit
+        args = []
+
+        # With the bindings the TIF is opened once and the same dataset
+        # is shared by the inspection and the translation below.
+        # GTiff sets up its .aux.xml handling when opening, so PAM is disabled here too
+        if USE_GDAL_BINDINGS:
+            with gdal_config_options({'GDAL_PAM_ENABLED': 'NO'}):
+                src = gdal.Open(str(tif_file))
+        else:
+            src = tif_file
+
+        # Band layout and value ranges come from a single gdalinfo pass;
+        # only float rasters need their pixels read for percentile scaling
+        try:
+            bands = get_tif_info(src).get('bands', [])
+            band_count = len(bands)
+            dtype = bands[0]['type'] if band_count > 0 else None
+
+            # Build command based on file characteristics
+            args = ["-of", "JPEG", "-co", "QUALITY=95"]
+
+            if band_count == 1:
+                # Single band - duplicate to 3 bands for RGB
+                # Use -b 1 -b 1 -b 1 to duplicate the band (doesn't require color table)
+                if dtype in ['Float32', 'Float64']:
+                    # Get min/max for scaling using percentiles to avoid outliers
+                    scale_range = get_percentile_range(tif_file, 1)
+                    if scale_range is not None:
+                        min_val, max_val, abs_min, abs_max = scale_range
+                        if max_val > min_val:
+                            # Scale to 0-255, convert to Byte, then duplicate to 3 bands
+                            logger.debug(f"Scaling {tif_file.name}: {min_val:.2f} to {max_val:.2f} (range: {abs_min:.2f} to {abs_max:.2f})")
+                            args.extend(["-scale", str(min_val), str(max_val), "0", "255"])
+                            args.extend(["-ot", "Byte"])
+                            args.extend(["-b", "1", "-b", "1", "-b", "1"])  # Duplicate band to RGB
+                        else:
+                            # All same value - use default scaling
+                            logger.warning(f"{tif_file.name}: All values are the same ({min_val:.2f}), using default scaling")
+                            args.extend(["-scale", "0", "1", "0", "255"])
+                            args.extend(["-ot", "Byte"])
+                            args.extend(["-b", "1", "-b", "1", "-b", "1"])
+                    else:
+                        # No valid data - just convert and duplicate
+                        logger.warning(f"{tif_file.name}: No valid data found")
+                        args.extend(["-ot", "Byte"])
+                        args.extend(["-b", "1", "-b", "1", "-b", "1"])
+                else:
+                    # Integer single band - convert to Byte if needed, then duplicate to RGB
+                    if dtype != 'Byte':
+                        # For integer types, scale to 0-255 range
+                        value_range = get_band_range(bands)
+                        if value_range is not None:
+                            min_val, max_val = value_range
+                            if max_val > min_val and max_val > 255:
+                                # Scale down if needed
+                                logger.debug(f"Scaling integer {tif_file.name}: {min_val} to {max_val}")
+                                args.extend(["-scale", str(min_val), str(max_val), "0", "255"])
+                        args.extend(["-ot", "Byte"])
+                    # Duplicate band to create 3-band RGB
+                    args.extend(["-b", "1", "-b", "1", "-b", "1"])
+            elif band_count == 3:
+                # Already RGB
+                if dtype in ['Float32', 'Float64']:
+                    # Get overall min/max across all bands for scaling using percentiles
+                    scale_range = get_percentile_range(tif_file)
+                    if scale_range is not None:
+                        min_val, max_val, abs_min, abs_max = scale_range
+                        if max_val > min_val:
+                            logger.debug(f"Scaling RGB {tif_file.name}: {min_val:.2f} to {max_val:.2f} (range: {abs_min:.2f} to {abs_max:.2f})")
+                            args.extend(["-scale", str(min_val), str(max_val), "0", "255"])
+                        else:
+                            logger.warning(f"{tif_file.name}: All RGB values are the same ({min_val:.2f})")
+                            args.extend(["-scale", "0", "1", "0", "255"])
+                    # Output as Byte
+                    args.extend(["-ot", "Byte"])
+                else:
+                    # Integer RGB - check if needs scaling (16-bit to 8-bit)
+                    if dtype == 'UInt16':
+                        # Check actual value range
+                        value_range = get_band_range(bands)
+                        if value_range is not None:
+                            min_val, max_val = value_range
+                            if max_val > 255:
+                                # 16-bit data, scale to 8-bit
+                                logger.debug(f"Scaling 16-bit RGB {tif_file.name}: {min_val} to {max_val}")
+                                args.extend(["-scale", str(min_val), str(max_val), "0", "255"])
+                            else:
+                                # Already 8-bit range, just convert type
+                                logger.debug(f"RGB {tif_file.name} already in 8-bit range ({min_val} to {max_val})")
+                        args.extend(["-ot", "Byte"])
+                    # Already 8-bit or other integer type, should be fine
+            elif band_count > 3:
+                # Use first 3 bands
+                args.extend(["-b", "1", "-b", "2", "-b", "3"])
+                if dtype in ['Float32', 'Float64']:
+                    args.extend(["-ot", "Byte"])  # Convert to byte
+
+        except Exception as e:
+            logger.warning(f"Could not analyze {tif_file.name}: {e}, using simple conversion")
+            # Fallback: simple conversion with band duplication
+            args = [
+                "-of", "JPEG",
+                "-co", "QUALITY=95",
+                "-b", "1", "-b", "1", "-b", "1",  # Duplicate to RGB
+            ]
+
+        # Run conversion
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running gdal_translate: %s %s %s", ' '.join(args), tif_file, jpg_file)
+        try:
+            output = gdal_translate(src, jpg_file, args)
+        except RuntimeError as e:
+            error_msg = f"gdal_translate failed: {e}"
+            logger.error(f"Error converting {tif_file.name}: {error_msg}")
+            return None, f"{tif_file.name}: {error_msg}"
+        finally:
+            src = None # Close the source dataset
+
+        # Check for warnings/errors in output
+        if output:
+            if "error" in output.lower():
+                logger.warning(f"gdal_translate errors for {tif_file.name}: {output}")
+                # Don't fail immediately, check if file was created
+            else:
+                logger.debug(f"gdal_translate info for {tif_file.name}: {output}")
+
+        # Verify JPG file was created and is valid, using a single
+        # open + fstat + read while the file is still in the page cache
+        try:
+            with open(jpg_file, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size == 0:
+                    return None, f"{tif_file.name}: JPG file is empty after conversion"
+
+                # Verify it's a valid JPEG by checking file header
+                header = f.read(2)
+                if header != b'\xff\xd8':  # JPEG magic number
+                    return None, f"{tif_file.name}: JPG file has invalid header (not a valid JPEG)"
+        except FileNotFoundError:
+            return None, f"{tif_file.name}: JPG file was not created"
+        except Exception as e:
+            return None, f"{tif_file.name}: Could not verify JPG file: {e}"
+
+        # SKIP GPS EXIF entirely for LAS-derived images
+        # The point cloud coordinate system is unclear and may be in a projected CRS (UTM)
+        # Adding GPS EXIF from GeoTIFF coordinates causes coordinate system confusion,
+        # leading to extreme Z values (-2315296500) during georeferencing that overflow int32
+        # OpenSfM doesn't require GPS for reconstruction - it uses feature matching
+        # The spatial diversity (different cropped regions, resolutions, angles) is sufficient
+        jpg_file_path = str(jpg_file.resolve())
+        logger.debug("Converted %s -> %s (%s bytes)", tif_file.name, jpg_file_path, file_size)
+        return jpg_file_path, None
+    except Exception as e:
+        error_detail = str(e)
+        logger.error(f"Failed to convert {tif_file.name}: {error_detail}")
+        return None, f"Failed to convert {tif_file.name}: {error_detail}"
+
+def convert_tifs_to_jpgs(input_dir, output_dir, on_converted=None):
     """
     Convert TIF files to JPEG format with GPS EXIF metadata.
     
+    :param on_converted: optional function called (from the calling thread) with
+        the path of each JPEG as soon as it's converted, e.g. to add it to an archive
     Returns tuple: (success: bool, jpg_files: list, error: str)
+    jpg_files holds the absolute paths of every JPEG that was written; success is
+    False only when none were.
     """
     input_dir = Path(input_dir)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Find all TIF files (case insensitive)
-    tif_files = list(input_dir.glob("*.tif")) + list(input_dir.glob("*.TIF"))
+    tif_files = find_files(input_dir, ["*.tif", "*.TIF"], first_match=False)
     if len(tif_files) == 0:
         logger.warning(f"No TIF files found in {input_dir} to convert to JPG")
         return False, [], "No TIF files found to convert"
     
     logger.info(f"Found {len(tif_files)} TIF files to convert to JPG in {input_dir}")
     
-    gdal_translate = shutil.which('gdal_translate')
-    if not gdal_translate:
+    if not USE_GDAL_BINDINGS and not check_gdal():
         return False, [], "gdal_translate not found"
     
     jpg_files = []
     errors = []
     
-    for tif_file in tif_files:
-        jpg_file = output_dir / f"{tif_file.stem}.jpg"
-        try:
-            # Check if file is readable first
-            if not os.path.exists(tif_file) or os.path.getsize(tif_file) == 0:
-                errors.append(f"{tif_file.name}: File is empty or missing")
-                continue
-            
-            # Convert TIF to JPG with proper handling for different data types
-            # For single-band (grayscale), convert to RGB
-            # For float data, scale to 8-bit
-            cmd = []
-            
-            # Check if it's a single-band file and needs conversion
-            try:
-                import rasterio
-                import numpy as np
-                with rasterio.open(str(tif_file)) as src:
-                    band_count = src.count
-                    dtype = src.dtypes[0]
-                    
-                    # Build command based on file characteristics
-                    cmd = [gdal_translate, "-of", "JPEG", "-co", "QUALITY=95"]
-                    
-                    if band_count == 1:
-                        # Single band - duplicate to 3 bands for RGB
-                        # Use -b 1 -b 1 -b 1 to duplicate the band (doesn't require color table)
-                        if dtype in ['float32', 'float64']:
-                            # Get min/max for scaling using percentiles to avoid outliers
-                            data = src.read(1)
-                            # Handle nodata
-                            if src.nodata is not None:
-                                data_valid = data[data != src.nodata]
-                            else:
-                                data_valid = data[~np.isnan(data)]
-                            
-                            if len(data_valid) > 0:
-                                # Use 2nd and 98th percentile for more robust scaling
-                                p2 = float(np.percentile(data_valid, 2))
-                                p98 = float(np.percentile(data_valid, 98))
-                                abs_min = float(data_valid.min())
-                                abs_max = float(data_valid.max())
-                                
-                                # Use percentiles if they provide better range, otherwise use absolute min/max
-                                if p98 > p2 and (p98 - p2) > (abs_max - abs_min) * 0.1:
-                                    min_val = p2
-                                    max_val = p98
-                                else:
-                                    min_val = abs_min
-                                    max_val = abs_max
-                                
-                                if max_val > min_val:
-                                    # Scale to 0-255, convert to Byte, then duplicate to 3 bands
-                                    logger.debug(f"Scaling {tif_file.name}: {min_val:.2f} to {max_val:.2f} (range: {abs_min:.2f} to {abs_max:.2f})")
-                                    cmd.extend(["-scale", str(min_val), str(max_val), "0", "255"])
-                                    cmd.extend(["-ot", "Byte"])
-                                    cmd.extend(["-b", "1", "-b", "1", "-b", "1"])  # Duplicate band to RGB
-                                else:
-                                    # All same value - use default scaling
-                                    logger.warning(f"{tif_file.name}: All values are the same ({min_val:.2f}), using default scaling")
-                                    cmd.extend(["-scale", "0", "1", "0", "255"])
-                                    cmd.extend(["-ot", "Byte"])
-                                    cmd.extend(["-b", "1", "-b", "1", "-b", "1"])
-                            else:
-                                # No valid data - just convert and duplicate
-                                logger.warning(f"{tif_file.name}: No valid data found")
-                                cmd.extend(["-ot", "Byte"])
-                                cmd.extend(["-b", "1", "-b", "1", "-b", "1"])
-                        else:
-                            # Integer single band - convert to Byte if needed, then duplicate to RGB
-                            if dtype not in ['uint8', 'Byte']:
-                                # For integer types, scale to 0-255 range
-                                data = src.read(1)
-                                if src.nodata is not None:
-                                    data_valid = data[data != src.nodata]
-                                else:
-                                    data_valid = data
-                                
-                                if len(data_valid) > 0:
-                                    min_val = int(data_valid.min())
-                                    max_val = int(data_valid.max())
-                                    if max_val > min_val and max_val > 255:
-                                        # Scale down if needed
-                                        logger.debug(f"Scaling integer {tif_file.name}: {min_val} to {max_val}")
-                                        cmd.extend(["-scale", str(min_val), str(max_val), "0", "255"])
-                                    cmd.extend(["-ot", "Byte"])
-                                else:
-                                    cmd.extend(["-ot", "Byte"])
-                            # Duplicate band to create 3-band RGB
-                            cmd.extend(["-b", "1", "-b", "1", "-b", "1"])
-                    elif band_count == 3:
-                        # Already RGB
-                        if dtype in ['float32', 'float64']:
-                            # Get overall min/max across all bands for scaling using percentiles
-                            all_data = src.read()
-                            if src.nodata is not None:
-                                data_valid = all_data[all_data != src.nodata]
-                            else:
-                                data_valid = all_data[~np.isnan(all_data)]
-                            
-                            if len(data_valid) > 0:
-                                # Use percentiles for more robust scaling
-                                p2 = float(np.percentile(data_valid, 2))
-                                p98 = float(np.percentile(data_valid, 98))
-                                abs_min = float(data_valid.min())
-                                abs_max = float(data_valid.max())
-                                
-                                if p98 > p2 and (p98 - p2) > (abs_max - abs_min) * 0.1:
-                                    min_val = p2
-                                    max_val = p98
-                                else:
-                                    min_val = abs_min
-                                    max_val = abs_max
-                                
-                                if max_val > min_val:
-                                    logger.debug(f"Scaling RGB {tif_file.name}: {min_val:.2f} to {max_val:.2f} (range: {abs_min:.2f} to {abs_max:.2f})")
-                                    cmd.extend(["-scale", str(min_val), str(max_val), "0", "255"])
-                                else:
-                                    logger.warning(f"{tif_file.name}: All RGB values are the same ({min_val:.2f})")
-                                    cmd.extend(["-scale", "0", "1", "0", "255"])
-                            # Output as Byte
-                            cmd.extend(["-ot", "Byte"])
-                        else:
-                            # Integer RGB - check if needs scaling (16-bit to 8-bit)
-                            if dtype in ['uint16', 'uint16_t']:
-                                # Check actual value range
-                                all_data = src.read()
-                                if src.nodata is not None:
-                                    data_valid = all_data[all_data != src.nodata]
-                                else:
-                                    data_valid = all_data
-                                
-                                if len(data_valid) > 0:
-                                    max_val = int(data_valid.max())
-                                    min_val = int(data_valid.min())
-                                    if max_val > 255:
-                                        # 16-bit data, scale to 8-bit
-                                        logger.debug(f"Scaling 16-bit RGB {tif_file.name}: {min_val} to {max_val}")
-                                        cmd.extend(["-scale", str(min_val), str(max_val), "0", "255"])
-                                        cmd.extend(["-ot", "Byte"])
-                                    elif max_val <= 255:
-                                        # Already 8-bit range, just convert type
-                                        logger.debug(f"RGB {tif_file.name} already in 8-bit range ({min_val} to {max_val})")
-                                        cmd.extend(["-ot", "Byte"])
-                                else:
-                                    cmd.extend(["-ot", "Byte"])
-                            # Already 8-bit or other integer type, should be fine
-                            pass
-                    elif band_count > 3:
-                        # Use first 3 bands
-                        cmd.extend(["-b", "1", "-b", "2", "-b", "3"])
-                        if dtype in ['float32', 'float64']:
-                            cmd.extend(["-ot", "Byte"])  # Convert to byte
-                    
-                    cmd.extend([str(tif_file), str(jpg_file)])
-            except ImportError:
-                # rasterio not available, use simple conversion
-                # Duplicate band to RGB (works for single-band files without color table)
-                cmd = [
-                    gdal_translate,
-                    "-of", "JPEG",
-                    "-co", "QUALITY=95",
-                    "-b", "1", "-b", "1", "-b", "1",  # Duplicate to RGB
-                    str(tif_file),
-                    str(jpg_file)
-                ]
-            except Exception as e:
-                logger.warning(f"Could not analyze {tif_file.name}: {e}, using simple conversion")
-                # Fallback: simple conversion with band duplication
-                cmd = [
-                    gdal_translate,
-                    "-of", "JPEG",
-                    "-co", "QUALITY=95",
-                    "-b", "1", "-b", "1", "-b", "1",  # Duplicate to RGB
-                    str(tif_file),
-                    str(jpg_file)
-                ]
-            
-            # Run conversion
-            logger.debug(f"Running gdal_translate: {' '.join(cmd)}")
-            try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    check=True,
-                    text=True
-                )
-            except subprocess.CalledProcessError as e:
-                error_msg = f"gdal_translate failed: {e.stderr if e.stderr else str(e)}"
-                logger.error(f"Error converting {tif_file.name}: {error_msg}")
-                errors.append(f"{tif_file.name}: {error_msg}")
-                continue
-            
-            # Check for warnings/errors in output
-            if result.stderr:
-                if "error" in result.stderr.lower():
-                    logger.warning(f"gdal_translate errors for {tif_file.name}: {result.stderr}")
-                    # Don't fail immediately, check if file was created
-                else:
-                    logger.debug(f"gdal_translate info for {tif_file.name}: {result.stderr}")
-            
-            # Verify JPG file was created and is valid
-            if not os.path.exists(jpg_file):
-                errors.append(f"{tif_file.name}: JPG file was not created")
-                continue
-                
-            file_size = os.path.getsize(jpg_file)
-            if file_size == 0:
-                errors.append(f"{tif_file.name}: JPG file is empty after conversion")
-                continue
-            
-            # Verify it's a valid JPEG by checking file header
-            try:
-                with open(jpg_file, 'rb') as f:
-                    header = f.read(2)
-                    if header != b'\xff\xd8':  # JPEG magic number
-                        errors.append(f"{tif_file.name}: JPG file has invalid header (not a valid JPEG)")
-                        continue
-            except Exception as e:
-                errors.append(f"{tif_file.name}: Could not verify JPG file: {e}")
-                continue
-            
-            # SKIP GPS EXIF entirely for LAS-derived images
-            # The point cloud coordinate system is unclear and may be in a projected CRS (UTM)
-            # Adding GPS EXIF from GeoTIFF coordinates causes coordinate system confusion,
-            # leading to extreme Z values (-2315296500) during georeferencing that overflow int32
-            # OpenSfM doesn't require GPS for reconstruction - it uses feature matching
-            # The spatial diversity (different cropped regions, resolutions, angles) is sufficient
-            logger.info(f"Skipping GPS EXIF for LAS-derived image {jpg_file.name} (OpenSfM uses feature matching, not GPS)")
-            
-            # Verify JPG file path is correct
-            jpg_file_path = str(jpg_file.resolve())
-            jpg_files.append(jpg_file_path)
-            logger.info(f"Successfully converted {tif_file.name} -> {jpg_file.name} ({file_size} bytes)")
-            logger.debug(f"JPG file path: {jpg_file_path}")
-        except Exception as e:
-            error_detail = str(e)
-            logger.error(f"Failed to convert {tif_file.name}: {error_detail}")
-            errors.append(f"Failed to convert {tif_file.name}: {error_detail}")
+    # Each conversion is independent and GDAL releases the GIL while
+    # decoding/encoding, so a small thread pool overlaps I/O and JPEG encoding
+    max_workers = min(8, len(tif_files), available_cpus())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for jpg_file_path, error in executor.map(lambda tif_file: convert_tif_to_jpg(tif_file, output_dir), tif_files):
+            if jpg_file_path is not None:
+                jpg_files.append(jpg_file_path)
+                if on_converted is not None:
+                    on_converted(jpg_file_path)
+            else:
+                errors.append(error)
     
     if len(jpg_files) == 0:
         error_summary = ', '.join(errors[:5])  # Show first 5 errors
@@ -609,6 +785,93 @@ def convert_tifs_to_jpgs(input_dir, output_dir):
     return True, jpg_files, None
 
 
+@contextmanager
+def open_zip(zip_path):
+    """
+    Open a ZIP archive at zip_path for writing conversion results.
+    The file is written through a large buffer so that member data
+    reaches the disk in big sequential writes.
+    """
+    with open(zip_path, 'wb', buffering=ZIP_WRITE_BUFFER_SIZE) as f:
+        with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1) as zipf:
+            yield zipf
+
+
+def add_to_zip(zipf, file_path):
+    """
+    Add a file to an open ZIP archive.
+    JPEGs and PNGs are already compressed, so they are stored as-is;
+    everything else gets a fast DEFLATE pass.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    compress_type = zipfile.ZIP_STORED if ext in ('.jpg', '.jpeg', '.png') else zipfile.ZIP_DEFLATED
+    zipf.write(file_path, os.path.basename(file_path), compress_type=compress_type)
+
+
+def create_zip(zip_path, files):
+    """
+    Bundle files into a ZIP archive at zip_path.
+    """
+    with open_zip(zip_path) as zipf:
+        for file_path in files:
+            if os.path.exists(file_path):
+                add_to_zip(zipf, file_path)
+            else:
+                logger.warning(f"File does not exist, skipping: {file_path}")
+
+
+def zip_stream(temp_dir):
+    """
+    Build a streaming ZIP of the converted images in a conversion temp directory
+    (the JPEGs if any were created, otherwise the GeoTIFFs)
+
+    :raises FileNotFoundError: if there are no images to download
+    """
+    paths = []
+    for subdir, extensions in (('jpg', ('.jpg', '.jpeg')), ('tif', ('.tif', '.tiff'))):
+        d = os.path.join(temp_dir, subdir)
+        if os.path.isdir(d):
+            paths = sorted(os.path.join(d, f) for f in os.listdir(d) if f.lower().endswith(extensions))
+        if paths:
+            break
+
+    if len(paths) == 0:
+        raise FileNotFoundError("No files available for download")
+
+    zs = ZipStream(sized=True)
+    for p in paths:
+        zs.add_path(p, os.path.basename(p))
+    return zs
+
+
+def locate_converted_file(temp_dir, filename):
+    """
+    Find filename in a conversion temp directory, looking into
+    the jpg/ and tif/ subdirectories before the top level.
+
+    :return: path to the file, or None if it does not exist
+    """
+    try:
+        with os.scandir(temp_dir) as it:
+            entries = {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    if filename != 'converted_images.zip':
+        for subdir in ('jpg', 'tif'):
+            entry = entries.get(subdir)
+            if entry is not None and entry.is_dir():
+                path = os.path.join(entry.path, filename)
+                if os.path.isfile(path):
+                    return path
+
+    entry = entries.get(filename)
+    if entry is not None and entry.is_file():
+        return entry.path
+
+    return None
+
+
 class LASConversionView(APIView):
     """
     API endpoint to convert LAS/LAZ files to images.
@@ -616,7 +879,9 @@ class LASConversionView(APIView):
     POST /api/las-convert/
     - Multipart form data with 'file' (LAS/LAZ file)
     - Optional parameters:
-      - mode: 'rgb', 'intensity', 'elevation', 'count' (default: 'rgb')
+      - mode: 'rgb', 'intensity', 'elevation', 'count' (default: 'rgb');
+        a comma separated list (e.g. 'rgb,elevation') creates one image per mode
+        when multiview is off
       - resolution: pixel resolution in meters (default: 0.1)
       - multiview: 'true' or 'false' (default: 'false')
       - tile_size: tile size in meters for multiview (default: 100)
@@ -627,6 +892,18 @@ class LASConversionView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = (permissions.IsAuthenticated,)
     
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream the upload in large chunks straight onto the filesystem the
+        # conversion will be staged on, so that it can be hardlinked in place.
+        # This must happen before authentication, as the CSRF check can
+        # already parse the request body.
+        if request.method == 'POST':
+            staging_dir = get_las_tmp_dir(int(request.META.get('CONTENT_LENGTH') or 0))
+            request.upload_handlers = [TemporaryFileUploadHandler(request, temp_dir=staging_dir,
+                                                                  prefix='las_conv_',
+                                                                  chunk_size=LAS_UPLOAD_CHUNK_SIZE)]
+        return super().initialize_request(request, *args, **kwargs)
+    
     def post(self, request):
         # Check prerequisites
         if not check_pdal():
@@ -643,6 +920,12 @@ class LASConversionView(APIView):
         # Validate file extension
         filename = las_file.name
         if not filename.lower().endswith(('.las', '.laz')):
+            # Don't leave the rejected upload behind (it might be in a tmpfs)
+            if hasattr(las_file, 'temporary_file_path'):
+                try:
+                    os.unlink(las_file.temporary_file_path())
+                except OSError:
+                    pass
             raise exceptions.ValidationError(
                 detail="File must be .las or .laz format"
             )
@@ -657,8 +940,17 @@ class LASConversionView(APIView):
         count = int(request.data.get('count', 30))
         convert_to_jpg = request.data.get('convert_to_jpg', 'true').lower() == 'true'  # Default to JPG for better compatibility
         
-        # Create temporary directories
-        temp_dir = tempfile.mkdtemp(dir=settings.MEDIA_TMP, prefix='las_conv_')
+        # Reap conversions that nobody downloaded (in the background)
+        cleanup_las_tmp_dirs_async()
+        
+        # Create temporary directories, next to the upload when it was
+        # streamed to disk so that it can be moved in place
+        is_temporary_upload = not isinstance(las_file, InMemoryUploadedFile) and hasattr(las_file, 'temporary_file_path')
+        if is_temporary_upload:
+            staging_dir = os.path.dirname(las_file.temporary_file_path())
+        else:
+            staging_dir = get_las_tmp_dir(las_file.size)
+        temp_dir = tempfile.mkdtemp(dir=staging_dir, prefix='las_conv_')
         tif_dir = os.path.join(temp_dir, 'tif')
         jpg_dir = os.path.join(temp_dir, 'jpg')
         os.makedirs(tif_dir, exist_ok=True)
@@ -671,39 +963,47 @@ class LASConversionView(APIView):
             # Handle different file upload types
             # WebODM uses ClosedTemporaryUploadedFile which closes the file after upload
             # to save file descriptors. We need to use temporary_file_path() for these.
-            from django.core.files.uploadedfile import InMemoryUploadedFile
+            if is_temporary_upload:
+                # Temporary files (including ClosedTemporaryUploadedFile) are on the
+                # same filesystem as temp_dir, so this is a rename rather than a
+                # copy of what can be a multi-GB point cloud
+                shutil.move(las_file.temporary_file_path(), las_path)
+            else:
+                with open(las_path, 'wb') as destination:
+                    if isinstance(las_file, InMemoryUploadedFile):
+                        # In-memory files: use chunks() method
+                        write_chunks(destination, las_file.chunks())
+                    else:
+                        # Fallback: try chunks() method
+                        try:
+                            write_chunks(destination, las_file.chunks())
+                        except (ValueError, OSError, IOError, AttributeError) as e:
+                            logger.error(f"Failed to read uploaded file: {e}")
+                            raise exceptions.ValidationError(
+                                detail=f"Failed to read uploaded file: {str(e)}"
+                            )
             
-            with open(las_path, 'wb') as destination:
-                if isinstance(las_file, InMemoryUploadedFile):
-                    # In-memory files: use chunks() method
-                    for chunk in las_file.chunks():
-                        destination.write(chunk)
-                elif hasattr(las_file, 'temporary_file_path'):
-                    # Temporary files (including ClosedTemporaryUploadedFile):
-                    # Copy from temporary file path
-                    with open(las_file.temporary_file_path(), 'rb') as source:
-                        shutil.copyfileobj(source, destination)
-                else:
-                    # Fallback: try chunks() method
-                    try:
-                        for chunk in las_file.chunks():
-                            destination.write(chunk)
-                    except (ValueError, OSError, IOError, AttributeError) as e:
-                        logger.error(f"Failed to read uploaded file: {e}")
-                        raise exceptions.ValidationError(
-                            detail=f"Failed to read uploaded file: {str(e)}"
-                        )
+            # Reject files that aren't point clouds before spending time in PDAL
+            if not is_las_file(las_path):
+                raise exceptions.ValidationError(detail="Not a valid LAS/LAZ file")
             
             # Convert LAS to images (synchronous)
             success, tif_files, error = convert_las_to_images(
                 las_path, tif_dir, resolution, mode, multiview, tile_size, overlap, count, use_perspective
             )
             
+            # Only the images are served from here on; don't keep a
+            # multi-GB point cloud (possibly in a tmpfs) until the cleanup
+            try:
+                os.unlink(las_path)
+            except OSError:
+                pass
+            
             if not success:
                 raise exceptions.ValidationError(detail=f"Conversion failed: {error}")
             
             # Ensure tif_files are absolute paths
-            tif_files = [str(Path(f).resolve()) if not os.path.isabs(f) else f for f in tif_files]
+            tif_files = [os.path.abspath(f) for f in tif_files]
             
             # Verify files exist
             existing_tif_files = [f for f in tif_files if os.path.exists(f)]
@@ -713,64 +1013,29 @@ class LASConversionView(APIView):
             
             # Convert TIF to JPG if requested
             output_files = tif_files
-            logger.info(f"convert_to_jpg parameter: {convert_to_jpg}")
-            logger.info(f"Number of TIF files created: {len(tif_files)}")
-            logger.info(f"TIF directory: {tif_dir}")
-            logger.info(f"JPG directory: {jpg_dir}")
+            logger.debug("Created %s TIF files in %s (convert_to_jpg=%s)", len(tif_files), tif_dir, convert_to_jpg)
             
             if convert_to_jpg:
                 logger.info(f"Converting {len(tif_files)} TIF files to JPG format...")
-                logger.info(f"TIF files: {[os.path.basename(f) for f in tif_files[:5]]}...")  # Show first 5
-                
-                # Check if TIF directory has files
-                tif_dir_files = list(Path(tif_dir).glob("*.tif")) + list(Path(tif_dir).glob("*.TIF"))
-                logger.info(f"TIF directory contains {len(tif_dir_files)} .tif files")
                 
                 jpg_success, jpg_files, jpg_error = convert_tifs_to_jpgs(tif_dir, jpg_dir)
-                logger.info(f"JPG conversion result: success={jpg_success}, files={len(jpg_files)}, error={jpg_error}")
+                logger.debug("JPG conversion result: success=%s, files=%s, error=%s", jpg_success, len(jpg_files), jpg_error)
                 
-                if jpg_success and len(jpg_files) > 0:
+                if jpg_success:
                     logger.info(f"Successfully converted {len(jpg_files)} files to JPG")
-                    # Ensure JPG files are absolute paths
-                    jpg_files = [str(Path(f).resolve()) if not os.path.isabs(f) else f for f in jpg_files]
                     output_files = jpg_files
                 else:
-                    error_msg = jpg_error if jpg_error else f"JPG conversion failed: {len(jpg_files)} files converted"
-                    logger.error(f"TIF to JPG conversion failed: {error_msg}")
                     # Fall back to TIF files if JPG conversion fails
-                    if len(jpg_files) == 0:
-                        logger.warning("No JPG files were created, using TIF files instead")
+                    logger.error(f"TIF to JPG conversion failed: {jpg_error}")
+                    logger.warning("No JPG files were created, using TIF files instead")
             else:
                 logger.info("JPG conversion disabled, keeping TIF files")
             
-            # Create a zip file with all images for easier download
-            import zipfile
-            zip_path = os.path.join(temp_dir, 'converted_images.zip')
+            logger.info(f"Prepared {len(output_files)} files for download")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Output files: %s...", [os.path.basename(f) for f in output_files[:5]])
             
-            # Verify output_files format
-            logger.info(f"Creating ZIP file with {len(output_files)} files")
-            logger.info(f"convert_to_jpg was: {convert_to_jpg}")
-            logger.info(f"Output files type check: {[os.path.splitext(f)[1].lower() for f in output_files[:5]]}")
-            logger.info(f"Output files: {[os.path.basename(f) for f in output_files[:5]]}...")
-            
-            # If JPG conversion was requested but we still have TIF files, check jpg_dir
-            if convert_to_jpg:
-                # Double-check jpg_dir has files
-                jpg_dir_files = list(Path(jpg_dir).glob("*.jpg")) + list(Path(jpg_dir).glob("*.JPG"))
-                logger.info(f"JPG directory contains {len(jpg_dir_files)} .jpg files")
-                if len(jpg_dir_files) > 0 and len(output_files) == len(tif_files):
-                    # JPG files exist but we're using TIF files - switch to JPG
-                    logger.warning("JPG files exist but output_files still contains TIF files. Switching to JPG files.")
-                    output_files = [str(f.resolve()) for f in jpg_dir_files]
-                    logger.info(f"Switched to {len(output_files)} JPG files")
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in output_files:
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, os.path.basename(file_path))
-                        logger.debug(f"Added to ZIP: {os.path.basename(file_path)} ({os.path.splitext(file_path)[1]})")
-                    else:
-                        logger.warning(f"File does not exist, skipping: {file_path}")
+            # The ZIP is generated on the fly by LASConversionDownloadView
             
             # Create file URLs
             base_url = request.build_absolute_uri('/')[:-1]
@@ -789,7 +1054,7 @@ class LASConversionView(APIView):
             logger.error(f"LAS conversion API error: {e}")
             # Cleanup on error
             if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
+                rmtree_async(temp_dir)
             raise exceptions.ValidationError(detail=f"Conversion failed: {str(e)}")
 
 
@@ -806,34 +1071,39 @@ class LASConversionDownloadView(APIView):
         temp_dir = os.path.basename(temp_dir)
         filename = os.path.basename(filename)
         
-        # Construct file path - check multiple locations
-        possible_paths = [
-            os.path.join(settings.MEDIA_TMP, temp_dir, 'converted_images.zip'),
-            os.path.join(settings.MEDIA_TMP, temp_dir, 'jpg', filename),
-            os.path.join(settings.MEDIA_TMP, temp_dir, 'tif', filename),
-            os.path.join(settings.MEDIA_TMP, temp_dir, filename),
-        ]
-        
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
+        # Only conversion directories can be served (they might live in a shared tmpfs)
+        if not temp_dir.startswith('las_conv_'):
+            raise exceptions.NotFound(detail="File not found")
+
+        # Look everywhere get_las_tmp_dir() might have staged the conversion
+        for base_dir in filter(None, (settings.LAS_TMP_DIR, FAST_TMP_DIR, settings.MEDIA_TMP)):
+            temp_dir_path = os.path.join(base_dir, temp_dir)
+            if os.path.isdir(temp_dir_path):
                 break
-        
-        if not file_path or not os.path.exists(file_path):
+        file_path = locate_converted_file(temp_dir_path, filename)
+
+        if file_path is None and filename == 'converted_images.zip':
+            try:
+                return download_file_stream(request, zip_stream(temp_dir_path), 'attachment', download_filename=filename)
+            except FileNotFoundError:
+                raise exceptions.NotFound(detail="File not found")
+
+        if file_path is None:
             raise exceptions.NotFound(detail="File not found")
         
-        # Check if it's a zip file or individual file
-        # Use FileResponse which properly handles file opening/closing
-        file_handle = open(file_path, 'rb')
-        response = FileResponse(file_handle)
-        if filename.endswith('.zip'):
-            response['Content-Type'] = 'application/zip'
-        elif filename.endswith('.jpg') or filename.endswith('.jpeg'):
-            response['Content-Type'] = 'image/jpeg'
-        elif filename.endswith('.tif') or filename.endswith('.tiff'):
-            response['Content-Type'] = 'image/tiff'
+        # Let nginx send the file when it can reach the staging area
+        if settings.USE_X_ACCEL_REDIRECT and base_dir in X_ACCEL_LOCATIONS:
+            response = HttpResponse()
+            response['Content-Type'] = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response['Content-Disposition'] = "attachment; filename={}".format(filename)
+            response['X-Accel-Redirect'] = X_ACCEL_LOCATIONS[base_dir] + quote(os.path.relpath(file_path, base_dir))
+            return response
         
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # FileResponse guesses the Content-Type from the filename and lets the
+        # WSGI server use wsgi.file_wrapper (sendfile) for the body
+        response = FileResponse(open(file_path, 'rb'), as_attachment=True, filename=filename)
+
+        # Read in 1MB blocks (instead of 4KB) when the body can't be sent with sendfile
+        response.block_size = 1 << 20
         return response
 
@@ -13,6 +13,8 @@ Usage:
 import os
 import sys
 import argparse
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -30,8 +32,145 @@ except ImportError:
     print("WARNING: rasterio not available, will try basic conversion")
     rasterio = None
 
+try:
+    from osgeo import gdal
+    gdal.UseExceptions()
+except ImportError:
+    gdal = None
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+
+def available_cpus():
+    """Number of CPUs this process is allowed to run on (honors affinity, unlike os.cpu_count())."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def normalize_band(band, out=None):
+    """
+    Stretch a band to the 0-255 range as uint8, with NaN values mapped to 0.
+    Works in place on a float32 copy instead of allocating a temporary per step.
+    
+    Args:
+        band: 2D numpy array (modified in place if it's already float32)
+        out: Optional uint8 array (or view) to write the result into
+    
+    Returns:
+        The normalized uint8 array (out, when given)
+    """
+    if out is None:
+        out = np.empty(band.shape, dtype=np.uint8)
+    
+    if band.dtype == np.uint8:
+        out[...] = band
+        return out
+    
+    band = band.astype(np.float32, copy=False)
+    nan_mask = np.isnan(band)
+    has_nan = nan_mask.any()
+    if has_nan and nan_mask.all():
+        out.fill(0)
+        return out
+    
+    band_min = np.nanmin(band) if has_nan else band.min()
+    band_max = np.nanmax(band) if has_nan else band.max()
+    if band_max <= band_min:
+        out.fill(0)
+        return out
+    
+    band -= band_min
+    band *= np.float32(255.0 / (band_max - band_min))
+    if has_nan:
+        band[nan_mask] = 0
+    np.copyto(out, band, casting='unsafe')
+    return out
+
+
+def bands_to_image(read_band, count, height, width, format='JPEG'):
+    """
+    Build a PIL image from the bands of a raster. Only the first band (grayscale)
+    or the first 3 bands (RGB) are used, and each one is normalized straight
+    into its place in the (H, W, C) image, so there's no stacking or transposing.
+    
+    Args:
+        read_band: Function returning band i (1-based) as a 2D numpy array
+        count: Number of bands in the raster
+        height, width: Size of the bands
+        format: 'JPEG' or 'PNG'
+    """
+    # Handle different band counts: grayscale stays single band
+    # unless it's going to a JPEG, anything else becomes RGB
+    if count == 1 and format != 'JPEG':
+        mode = 'L'
+        img_array = np.empty((height, width), dtype=np.uint8)
+    else:
+        mode = 'RGB'
+        img_array = np.empty((height, width, 3), dtype=np.uint8)
+    
+    band_count = 3 if count >= 3 else 1
+    for i in range(1, band_count + 1):
+        # Normalize to 0-255
+        normalize_band(read_band(i), out=img_array if mode == 'L' else img_array[..., i - 1])
+    
+    if mode == 'RGB' and band_count == 1:
+        # Single band, duplicate for RGB
+        img_array[..., 1] = img_array[..., 0]
+        img_array[..., 2] = img_array[..., 0]
+    
+    return Image.fromarray(img_array, mode=mode)
 
-def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95):
+
+def gdal_convert(input_file, output_file, format='JPEG', quality=95, max_dim=None):
+    """
+    Convert a raster with GDAL's JPEG/PNG drivers, letting GDAL stretch
+    each band's min/max to 0-255 in native code (no numpy arrays involved).
+    Uses the same band layout as bands_to_image, and like normalize_band
+    leaves 8-bit data as-is.
+    """
+    src = gdal.Open(str(input_file))
+    try:
+        if src.RasterCount >= 3:
+            band_list = [1, 2, 3]
+        elif format == 'JPEG':
+            band_list = [1, 1, 1]
+        else:
+            band_list = [1]
+        
+        byte_data = src.GetRasterBand(1).DataType == gdal.GDT_Byte
+        
+        width = height = 0
+        if max_dim and max(src.RasterXSize, src.RasterYSize) > max_dim:
+            if src.RasterXSize >= src.RasterYSize:
+                width = max_dim
+            else:
+                height = max_dim
+        
+        options = gdal.TranslateOptions(format=format, outputType=gdal.GDT_Byte, bandList=band_list,
+                                        scaleParams=None if byte_data else [[]], width=width, height=height, resampleAlg='average',
+                                        creationOptions=[f'QUALITY={quality}'] if format == 'JPEG' else [])
+        
+        # Don't leave .aux.xml sidecars with the georeferencing next to the outputs.
+        # Only for this thread and this call, so other GDAL users in the process keep their PAM files
+        previous_pam = gdal.GetThreadLocalConfigOption('GDAL_PAM_ENABLED', None)
+        gdal.SetThreadLocalConfigOption('GDAL_PAM_ENABLED', 'NO')
+        try:
+            ds = gdal.Translate(str(output_file), src, options=options)
+            if ds is None:
+                raise RuntimeError(gdal.GetLastErrorMsg())
+            ds = None # Close and flush to disk
+        finally:
+            gdal.SetThreadLocalConfigOption('GDAL_PAM_ENABLED', previous_pam)
+    finally:
+        src = None
+
+
+def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95, max_dim=None):
     """
     Convert GeoTIFF to JPEG/PNG format.
     
@@ -40,54 +179,42 @@ def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95):
         output_file: Output JPEG/PNG file
         format: 'JPEG' or 'PNG'
         quality: JPEG quality (1-100)
+        max_dim: Optional maximum width/height of the output; larger inputs
+                 are downsampled while being read (default: full resolution)
     """
     try:
+        # Fast path: GDAL does the whole conversion in a single pass
+        if gdal:
+            try:
+                gdal_convert(input_file, output_file, format, quality, max_dim)
+                return True
+            except Exception as e:
+                print(f"  Warning: GDAL conversion failed ({e}), trying rasterio...")
+        
         # Try to open as raster first (handles multi-band, georeferenced)
         if rasterio:
             try:
                 with rasterio.open(input_file) as src:
-                    # Read all bands
-                    bands = []
-                    for i in range(1, src.count + 1):
-                        band = src.read(i)
-                        # Normalize to 0-255
-                        if band.dtype != np.uint8:
-                            band_min = np.nanmin(band)
-                            band_max = np.nanmax(band)
-                            if band_max > band_min:
-                                band = ((band - band_min) / (band_max - band_min) * 255).astype(np.uint8)
-                            else:
-                                band = np.zeros_like(band, dtype=np.uint8)
-                        
-                        # Handle NaN values
-                        band = np.nan_to_num(band, nan=0).astype(np.uint8)
-                        bands.append(band)
+                    # Downsample while reading (GDAL uses overviews when present)
+                    # rather than reading full resolution bands we'd shrink anyway
+                    out_shape = None
+                    scale = max(src.width, src.height) / max_dim if max_dim else 1
+                    if scale > 1:
+                        out_shape = (max(1, int(src.height / scale)), max(1, int(src.width / scale)))
                     
-                    # Handle different band counts
-                    if len(bands) == 1:
-                        # Grayscale
-                        img_array = bands[0]
-                        mode = 'L'
-                    elif len(bands) >= 3:
-                        # RGB - take first 3 bands
-                        img_array = np.stack([bands[0], bands[1], bands[2]], axis=0)
-                        mode = 'RGB'
-                    else:
-                        # Single band, duplicate for RGB
-                        img_array = np.stack([bands[0], bands[0], bands[0]], axis=0)
-                        mode = 'RGB'
+                    height, width = out_shape if out_shape is not None else (src.height, src.width)
                     
-                    # Convert to PIL Image
-                    if mode == 'L':
-                        img = Image.fromarray(img_array, mode='L')
-                    else:
-                        # Transpose from (C, H, W) to (H, W, C)
-                        img_array = np.transpose(img_array, (1, 2, 0))
-                        img = Image.fromarray(img_array, mode='RGB')
+                    # Read all the bands we use with a single call, so GDAL
+                    # can fetch them in one pass over pixel-interleaved files
+                    indexes = [1, 2, 3] if src.count >= 3 else [1]
+                    read_options = {}
+                    if out_shape is not None:
+                        read_options = {'out_shape': (len(indexes),) + out_shape, 'resampling': Resampling.average}
+                    if any(src.dtypes[i - 1] != 'uint8' for i in indexes):
+                        read_options['out_dtype'] = np.float32
+                    bands = src.read(indexes, **read_options)
                     
-                    # Convert grayscale to RGB if needed for JPEG
-                    if mode == 'L' and format == 'JPEG':
-                        img = img.convert('RGB')
+                    img = bands_to_image(lambda i: bands[i - 1], src.count, height, width, format)
                     
                     # Save
                     img.save(output_file, format=format, quality=quality if format == 'JPEG' else None)
@@ -96,6 +223,27 @@ def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95):
             except Exception as e:
                 print(f"  Warning: Rasterio processing failed ({e}), trying PIL fallback...")
         
+        # Fallback: tifffile decodes straight into numpy arrays, including
+        # float and 16-bit multi-band data that Pillow can't open
+        if tifffile and Path(input_file).suffix.lower() in ('.tif', '.tiff'):
+            try:
+                arr = tifffile.imread(str(input_file))
+                if arr.ndim == 3 and arr.shape[0] < arr.shape[2]:
+                    # Planar (bands, H, W) layout
+                    arr = np.moveaxis(arr, 0, -1)
+                if arr.ndim == 2:
+                    arr = arr[..., np.newaxis]
+                if arr.ndim != 3:
+                    raise ValueError(f"unsupported array shape {arr.shape}")
+                
+                img = bands_to_image(lambda i: arr[..., i - 1], arr.shape[2], arr.shape[0], arr.shape[1], format)
+                if max_dim:
+                    img.thumbnail((max_dim, max_dim))
+                img.save(output_file, format=format, quality=quality if format == 'JPEG' else None)
+                return True
+            except Exception as e:
+                print(f"  Warning: tifffile processing failed ({e}), trying PIL fallback...")
+        
         # Fallback: Simple PIL conversion
         with Image.open(input_file) as img:
             # Convert to RGB if needed
@@ -104,6 +252,9 @@ def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95):
             elif img.mode == 'L' and format == 'JPEG':
                 img = img.convert('RGB')
             
+            if max_dim:
+                img.thumbnail((max_dim, max_dim))
+            
             # Save
             img.save(output_file, format=format, quality=quality if format == 'JPEG' else None)
             return True
@@ -113,7 +264,12 @@ def convert_geotiff_to_jpg(input_file, output_file, format='JPEG', quality=95):
         return False
 
 
-def convert_directory(input_dir, output_dir, format='JPEG', pattern='*.tif'):
+def _convert_one(args):
+    """Process pool entry point: convert_geotiff_to_jpg with a tuple of arguments."""
+    return convert_geotiff_to_jpg(*args)
+
+
+def convert_directory(input_dir, output_dir, format='JPEG', pattern='*.tif', quality=95, workers=None, max_dim=None):
     """
     Convert all TIF files in a directory.
     
@@ -122,6 +278,9 @@ def convert_directory(input_dir, output_dir, format='JPEG', pattern='*.tif'):
         output_dir: Output directory for JPEG/PNG files
         format: 'JPEG' or 'PNG'
         pattern: File pattern to match (default: *.tif)
+        quality: JPEG quality (1-100)
+        workers: Number of files converted in parallel (default: number of CPUs this process may use)
+        max_dim: Optional maximum width/height of the converted images
     """
     input_dir = Path(input_dir)
     output_dir = Path(output_dir)
@@ -132,10 +291,11 @@ def convert_directory(input_dir, output_dir, format='JPEG', pattern='*.tif'):
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Find all TIF files
-    tif_files = list(input_dir.glob(pattern))
-    if len(tif_files) == 0:
-        tif_files = list(input_dir.glob('*.TIF'))
+    # Find all TIF files, in a single case-insensitive pass over the directory
+    pattern = pattern.lower()
+    with os.scandir(input_dir) as it:
+        tif_files = sorted(Path(e.path) for e in it
+                           if e.is_file() and fnmatch.fnmatchcase(e.name.lower(), pattern))
     
     if len(tif_files) == 0:
         print(f"ERROR: No TIF files found in {input_dir}")
@@ -145,21 +305,26 @@ def convert_directory(input_dir, output_dir, format='JPEG', pattern='*.tif'):
     print(f"Output format: {format}")
     print()
     
+    # Create output filenames
+    extension = 'jpg' if format == 'JPEG' else 'png'
+    jobs = [(tif_file, output_dir / f"{tif_file.stem}.{extension}", format, quality, max_dim) for tif_file in tif_files]
+    
+    # Files are independent and the conversion is CPU bound
+    # (decoding, normalization, encoding), so spread them over processes
+    if workers is None:
+        workers = available_cpus()
+    workers = max(1, min(workers, len(jobs)))
+    
     converted = 0
-    for tif_file in tif_files:
-        # Create output filename
-        if format == 'JPEG':
-            output_file = output_dir / f"{tif_file.stem}.jpg"
-        else:
-            output_file = output_dir / f"{tif_file.stem}.png"
-        
-        print(f"Converting: {tif_file.name} -> {output_file.name}")
-        
-        if convert_geotiff_to_jpg(tif_file, output_file, format):
-            converted += 1
-            print(f"  ✓ Success")
-        else:
-            print(f"  ✗ Failed")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (tif_file, output_file, *_), success in zip(jobs, executor.map(_convert_one, jobs)):
+            print(f"Converting: {tif_file.name} -> {output_file.name}")
+            
+            if success:
+                converted += 1
+                print(f"  ✓ Success")
+            else:
+                print(f"  ✗ Failed")
     
     print(f"\n✓ Successfully converted {converted}/{len(tif_files)} files")
     print(f"  Output directory: {output_dir}")
@@ -193,12 +358,16 @@ Examples:
                        help='File pattern to match (default: *.tif)')
     parser.add_argument('--quality', type=int, default=95,
                        help='JPEG quality 1-100 (default: 95)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of files to convert in parallel (default: number of CPUs)')
+    parser.add_argument('--max-size', type=int, default=None,
+                       help='Downsample images larger than this many pixels in width/height (default: keep full resolution)')
     
     args = parser.parse_args()
     
     format = 'JPEG' if args.format in ['jpeg', 'jpg'] else 'PNG'
     
-    success = convert_directory(args.input, args.output, format, args.pattern)
+    success = convert_directory(args.input, args.output, format, args.pattern, args.quality, args.workers, args.max_size)
     
     sys.exit(0 if success else 1)
 
@@ -14,9 +14,32 @@ import os
 import sys
 import shutil
 import argparse
+import subprocess
 from pathlib import Path
 
 
+def link_or_copy(src, dst):
+    """
+    Place src at dst without copying its data when possible:
+    hardlink, then copy-on-write clone (btrfs/XFS), then a regular copy.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    
+    if sys.platform.startswith('linux') and shutil.which('cp'):
+        try:
+            subprocess.run(['cp', '--reflink=auto', '--preserve=timestamps', str(src), str(dst)],
+                          capture_output=True, check=True)
+            return
+        except subprocess.CalledProcessError:
+            pass
+    
+    shutil.copy2(src, dst)
+
+
 def create_align_file(input_file, output_dir=None):
     """
     Create align.las or align.laz file from input LAS/LAZ file.
@@ -48,9 +71,15 @@ def create_align_file(input_file, output_dir=None):
     # Create align filename
     align_file = output_dir / f"align{input_file.suffix.lower()}"
     
-    # Copy the file
+    if align_file.exists() and align_file.samefile(input_file):
+        print(f"Input file is already an alignment file: {align_file}")
+        return align_file
+    
+    # Link/copy the file (an existing align file is replaced)
     try:
-        shutil.copy2(input_file, align_file)
+        if align_file.exists() or align_file.is_symlink():
+            align_file.unlink()
+        link_or_copy(input_file, align_file)
         print(f"✓ Created alignment file: {align_file}")
         print(f"  Original file: {input_file}")
         print(f"\nYou can now upload {align_file} to WebODM along with your photos.")
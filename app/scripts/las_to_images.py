@@ -19,24 +19,203 @@ import subprocess
 import json
 import math
 import tempfile
+import shutil
+import copy
+import logging
+import threading
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
 
-def check_pdal():
-    """Check if PDAL is installed and available."""
+try:
+    import pdal
+except ImportError:
+    pdal = None
+
+# GDAL settings for rasterizing and stacking: a larger block cache and
+# multithreaded compression. They only apply to the conversions themselves
+# (see conversion_gdal_config), and values already configured win.
+# Conversions running in a pool get a share of the CPUs (see limit_gdal_threads)
+GDAL_CONFIG = {
+    "GDAL_CACHEMAX": "25%",
+    "GDAL_NUM_THREADS": "ALL_CPUS",
+}
+
+try:
+    from osgeo import gdal
+    gdal.UseExceptions()
+except ImportError:
+    gdal = None
+
+try:
+    import rasterio
+    import rasterio.errors
+    import rasterio.transform
+    import rasterio.windows
+    from rasterio.enums import Resampling
+except ImportError:
+    rasterio = None
+
+# GeoTIFF creation options for the rasters written by writers.gdal.
+# Rasters are tiled so readers can fetch (and decompress) blocks in parallel,
+# blocks are compressed on GDAL_NUM_THREADS threads (the GTiff driver's default
+# without NUM_THREADS), and floating point rasters use
+# the floating point predictor (PREDICTOR=2 only suits integers)
+GTIFF_OPTS = "COMPRESS=DEFLATE,PREDICTOR=2,TILED=YES,BLOCKXSIZE=512,BLOCKYSIZE=512,BIGTIFF=YES"
+GTIFF_FLOAT_OPTS = "COMPRESS=DEFLATE,PREDICTOR=3,TILED=YES,BLOCKXSIZE=512,BLOCKYSIZE=512,BIGTIFF=YES"
+
+# Perspective views are checked for data on a read at most this many pixels wide/high
+VERIFY_MAX_DIM = 1024
+
+# Previews (--preview) only sample the points at resolutions coarser than this (meters)
+PREVIEW_MIN_RESOLUTION = 0.2
+
+# writers.copc can't stream, it holds every point in memory while building the
+# octree (roughly 100 bytes per point). Per-tile fallbacks only index the cloud
+# when it's small enough for that, and there are enough tiles to pay it back
+COPC_MAX_POINTS = 20 * 1000 * 1000
+COPC_MIN_TILES = 4
+
+
+@contextmanager
+def gdal_config_options(options):
+    """
+    Set GDAL configuration options for the calling thread only, for the
+    duration of a with block, and restore the previous values afterwards
+    (like gdal.config_options(), which needs GDAL 3.7).
+    Does nothing without the GDAL bindings.
+    """
+    if gdal is None:
+        yield
+        return
+    
+    previous = {key: gdal.GetThreadLocalConfigOption(key, None) for key in options}
+    for key, value in options.items():
+        gdal.SetThreadLocalConfigOption(key, value)
     try:
-        subprocess.run(["pdal", "--version"], 
-                      capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        yield
+    finally:
+        for key, value in previous.items():
+            gdal.SetThreadLocalConfigOption(key, value)
+
+
+_gdal_threads = threading.local()
+
+
+def limit_gdal_threads(workers):
+    """
+    ThreadPoolExecutor initializer for pools of conversions: the CPUs are
+    split among the workers, rather than every conversion in the pool
+    starting a compression thread per CPU.
+    """
+    _gdal_threads.count = max(1, available_cpus() // workers)
+
+
+def gdal_num_threads():
+    """GDAL_NUM_THREADS for the conversions run in the calling thread (see limit_gdal_threads)."""
+    return str(getattr(_gdal_threads, 'count', GDAL_CONFIG["GDAL_NUM_THREADS"]))
+
+
+def conversion_config():
+    """GDAL_CONFIG, with the number of threads the calling thread may use."""
+    return dict(GDAL_CONFIG, GDAL_NUM_THREADS=gdal_num_threads())
+
+
+@contextmanager
+def conversion_gdal_config():
+    """
+    Apply GDAL_CONFIG to the conversions run in the calling thread (PDAL
+    pipelines and GDAL calls through the bindings), leaving options that are
+    already configured, e.g. in the environment, and the rest of the process alone.
+    """
+    if gdal is None:
+        yield
+        return
+    
+    with gdal_config_options({key: value for key, value in conversion_config().items()
+                              if gdal.GetConfigOption(key) is None}):
+        yield
+
+
+def gdal_env():
+    """Environment for PDAL/GDAL command line tools (see GDAL_CONFIG)."""
+    return {**conversion_config(), **os.environ}
+
+
+def available_cpus():
+    """Number of CPUs this process is allowed to run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def file_size(path):
+    """Size of a file in bytes, or None if it doesn't exist (a single stat call)."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def remove_files(paths):
+    """Delete files, ignoring those that don't exist."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def check_pdal():
+    """Check if PDAL is installed and available (Python bindings or command line tool)."""
+    return pdal is not None or shutil.which('pdal') is not None
+
+
+@lru_cache(maxsize=None)
+def gdal_tool_path(name):
+    """Path to a GDAL command line tool, or None."""
+    return shutil.which(name)
 
 
 def get_las_info(las_file):
-    """Get information about the LAS file using PDAL."""
+    """
+    Get information about the LAS file using PDAL.
+    Results are cached for as long as the file's size and mtime don't change.
+    """
+    try:
+        st = os.stat(las_file)
+    except OSError as e:
+        logger.error(f"Could not read LAS file info: {e}")
+        return None
+    info = _get_las_info(str(las_file), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(info)
+
+
+@lru_cache(maxsize=8)
+def _get_las_info(las_file, mtime_ns, size):
+    """get_las_info() implementation; mtime_ns and size only key the cache."""
+    if pdal is not None:
+        try:
+            # Header-only read through the Python bindings,
+            # returned in the same shape as `pdal info --summary`
+            quickinfo = pdal.Pipeline(json.dumps([str(las_file)])).quickinfo
+            reader_info = next(iter(quickinfo.values()))
+            return {
+                'bounds': reader_info.get('bounds', {}),
+                'count': reader_info.get('num_points', 0),
+                'dimensions': reader_info.get('dimensions', ''),
+                'srs': reader_info.get('srs', {}),
+            }
+        except Exception as e:
+            logger.warning(f"PDAL bindings could not read {las_file} ({e}), falling back to pdal info")
+
     try:
         result = subprocess.run(
-            ["pdal", "info", "--summary", las_file],
+            ["pdal", "info", "--summary", str(las_file)],
             capture_output=True,
             check=True,
             text=True
@@ -44,7 +223,7 @@ def get_las_info(las_file):
         info = json.loads(result.stdout)
         return info.get('summary', {})
     except Exception as e:
-        print(f"ERROR: Could not read LAS file info: {e}")
+        logger.error(f"Could not read LAS file info: {e}")
         return None
 
 
@@ -74,7 +253,19 @@ def calculate_resolution(bounds, point_count, default=0.1):
     return default
 
 
-def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'):
+def preview_stages(resolution, mode):
+    """
+    Stages thinning out a point cloud for a low resolution preview: with
+    cells this large, averaging a subset of the points within each cell
+    looks the same, and the rasterization has far fewer points to process.
+    Not used for fine resolutions, nor for count mode (it would change the counts).
+    """
+    if resolution <= PREVIEW_MIN_RESOLUTION or mode == 'count':
+        return []
+    return [{"type": "filters.sample", "radius": resolution / 2}]
+
+
+def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity', preview=False):
     """
     Rasterize a point cloud to a GeoTIFF image using PDAL.
     
@@ -83,6 +274,7 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
         output_file: Output GeoTIFF file path
         resolution: Pixel resolution in meters (default: 0.1)
         mode: Rasterization mode ('intensity', 'rgb', 'elevation', 'count')
+        preview: If True, sample the points first for a faster, approximate image (see preview_stages)
     
     Returns:
         (True, None) if successful, (False, error_message) otherwise
@@ -92,49 +284,20 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
         if mode == 'rgb':
             # Build true 3-band RGB by creating separate R/G/B rasters and stacking with GDAL
             # LAS RGB values are typically 16-bit (0-65535) and need scaling to 8-bit (0-255)
-            import tempfile
-            import shutil
 
             tmpdir = tempfile.mkdtemp(prefix="lasrgb_")
             red_tif = os.path.join(tmpdir, "red.tif")
             green_tif = os.path.join(tmpdir, "green.tif")
             blue_tif = os.path.join(tmpdir, "blue.tif")
 
-            def pdal_band(out_path, dim):
-                pj = {
-                    "pipeline": [
-                        {"type": "readers.las", "filename": str(las_file)},
-                        {
-                            "type": "writers.gdal",
-                            "filename": str(out_path),
-                            "resolution": resolution,
-                            "radius": resolution,
-                            "output_type": "mean",
-                            "dimension": dim,
-                            "data_type": "uint16_t",
-                            "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                        }
-                    ]
-                }
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                    json.dump(pj, f)
-                    pf = f.name
-                try:
-                    result = subprocess.run(["pdal", "pipeline", pf], 
-                                          capture_output=True, check=True, text=True)
-                except subprocess.CalledProcessError as e:
-                    error_msg = f"Failed to create {dim} band: {e.stderr if e.stderr else str(e)}"
-                    print(f"Warning: {error_msg}")
-                    raise Exception(error_msg)
-                finally:
-                    if os.path.exists(pf):
-                        os.unlink(pf)
-
             try:
-                print("Creating RGB bands...")
-                pdal_band(red_tif, "Red")
-                pdal_band(green_tif, "Green")
-                pdal_band(blue_tif, "Blue")
+                logger.info("Creating RGB bands...")
+                reader_stages = [{"type": "readers.las", "filename": str(las_file)}]
+                if preview:
+                    reader_stages += preview_stages(resolution, mode)
+                success, error = run_pipeline(rgb_bands_pipeline(reader_stages, (red_tif, green_tif, blue_tif), resolution))
+                if not success:
+                    raise Exception(f"Failed to create RGB bands: {error}")
                 
                 # Verify files were created
                 if not all(os.path.exists(f) for f in [red_tif, green_tif, blue_tif]):
@@ -142,53 +305,35 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
                     
             except Exception as e:
                 error_msg = f"RGB band creation failed: {e}"
-                print(error_msg)
-                print("Falling back to intensity mode...")
+                logger.warning(error_msg)
+                logger.info("Falling back to intensity mode...")
                 shutil.rmtree(tmpdir, ignore_errors=True)
-                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity')
+                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity', preview=preview)
                 if not result:
                     return False, error_msg
                 return True, None
 
-            # Stack with GDAL and normalize 16-bit RGB to 8-bit
-            gdalbuildvrt = shutil.which('gdalbuildvrt')
-            gdal_translate = shutil.which('gdal_translate')
-            if not gdalbuildvrt or not gdal_translate:
+            # Stack the bands into an RGB GeoTIFF with GDAL
+            if not can_stack_rgb_bands():
                 error_msg = "GDAL tools not found, falling back to intensity."
-                print(error_msg)
+                logger.warning(error_msg)
                 shutil.rmtree(tmpdir, ignore_errors=True)
-                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity')
+                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity', preview=preview)
                 if not result:
                     return False, error_msg
                 return True, None
 
-            vrt_path = os.path.join(tmpdir, "rgb.vrt")
             try:
-                # Build VRT with separate bands
-                result = subprocess.run([gdalbuildvrt, "-separate", vrt_path, red_tif, green_tif, blue_tif],
-                                      capture_output=True, check=True, text=True)
-                
-                # Convert to 8-bit RGB GeoTIFF with proper scaling
-                # Scale from 16-bit (0-65535) to 8-bit (0-255)
-                # Use -scale to normalize the values
-                result = subprocess.run([
-                    gdal_translate, vrt_path, str(output_file),
-                    "-ot", "Byte",  # Output as 8-bit
-                    "-scale", "0", "65535", "0", "255",  # Scale 16-bit to 8-bit
-                    "-co", "COMPRESS=DEFLATE",
-                    "-co", "PREDICTOR=2", 
-                    "-co", "PHOTOMETRIC=RGB",
-                    "-co", "BIGTIFF=YES"
-                ], capture_output=True, check=True, text=True)
+                stack_rgb_bands((red_tif, green_tif, blue_tif), output_file)
                 
-                print(f"✓ Successfully created RGB image: {output_file}")
+                logger.info(f"✓ Successfully created RGB image: {output_file}")
                 return True, None
-            except subprocess.CalledProcessError as e:
-                error_msg = f"GDAL stacking failed: {e.stderr if e.stderr else str(e)}"
-                print(error_msg)
-                print("Falling back to intensity mode...")
+            except RuntimeError as e:
+                error_msg = f"GDAL stacking failed: {e}"
+                logger.warning(error_msg)
+                logger.info("Falling back to intensity mode...")
                 shutil.rmtree(tmpdir, ignore_errors=True)
-                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity')
+                result, _ = rasterize_pointcloud(las_file, output_file, resolution, mode='intensity', preview=preview)
                 if not result:
                     return False, error_msg
                 return True, None
@@ -211,7 +356,8 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
                         "output_type": "mean",
                         "dimension": "Z",
                         "data_type": "float32",  # Use float32 instead of default (which might be float64)
-                        "gdalopts": "COMPRESS=DEFLATE,BIGTIFF=YES"  # Remove PREDICTOR=2 for elevation
+                        "nodata": writer_nodata("float32"),
+                        "gdalopts": GTIFF_FLOAT_OPTS  # Floating point predictor for elevation
                     }
                 ]
             }
@@ -231,7 +377,8 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
                         "output_type": "mean",
                         "dimension": "Intensity",
                         "data_type": "uint16_t",  # Intensity is typically 16-bit
-                        "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
+                        "nodata": writer_nodata("uint16_t"),
+                        "gdalopts": GTIFF_OPTS
                     }
                 ]
             }
@@ -250,56 +397,571 @@ def rasterize_pointcloud(las_file, output_file, resolution=0.1, mode='intensity'
                         "radius": resolution,
                         "output_type": "count",
                         "data_type": "uint32_t",  # Count is unsigned integer
-                        "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
+                        "nodata": writer_nodata("uint32_t"),
+                        "gdalopts": GTIFF_OPTS
                     }
                 ]
             }
         
-        # Write pipeline to temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(pipeline_json, f)
-            pipeline_file = f.name
+        if preview:
+            pipeline_json["pipeline"][1:1] = preview_stages(resolution, mode)
         
-        try:
-            # Run PDAL pipeline
-            result = subprocess.run(
-                ["pdal", "pipeline", pipeline_file],
-                capture_output=True,
-                check=True,
-                text=True
-            )
-            
-            # Verify output file was created
-            if not os.path.exists(output_file):
-                error_msg = f"PDAL pipeline completed but output file was not created: {output_file}"
-                print(f"ERROR: {error_msg}")
-                return False, error_msg
-            
-            file_size = os.path.getsize(output_file)
-            if file_size == 0:
-                error_msg = f"Output file is empty (0 bytes): {output_file}"
-                print(f"ERROR: {error_msg}")
-                return False, error_msg
-            
-            print(f"✓ Successfully created: {output_file} ({file_size} bytes)")
-            return True, None
-            
-        finally:
-            # Clean up temporary pipeline file
-            if os.path.exists(pipeline_file):
-                os.unlink(pipeline_file)
+        # Run PDAL pipeline
+        success, error = run_pipeline(pipeline_json)
+        if not success:
+            error_msg = f"PDAL processing failed: {error}"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        # Verify output file was created
+        size = file_size(output_file)
+        if size is None:
+            error_msg = f"PDAL pipeline completed but output file was not created: {output_file}"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        if size == 0:
+            error_msg = f"Output file is empty (0 bytes): {output_file}"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        logger.info(f"✓ Successfully created: {output_file} ({size} bytes)")
+        return True, None
                 
-    except subprocess.CalledProcessError as e:
-        error_msg = f"PDAL processing failed: {e.stderr if e.stderr else str(e)}"
-        if e.stdout:
-            error_msg += f"\nPDAL stdout: {e.stdout[:500]}"
-        print(f"ERROR: {error_msg}")
-        return False, error_msg
     except Exception as e:
         error_msg = f"Failed to rasterize point cloud: {str(e)}"
-        print(f"ERROR: {error_msg}")
+        logger.error(error_msg)
+        return False, error_msg
+
+
+def writer_nodata(data_type):
+    """
+    nodata value for a writers.gdal raster of data_type. PDAL's default of -9999
+    can't be stored in the unsigned types, so cells without points would be
+    indistinguishable from data; those use 0 instead.
+    """
+    return 0 if data_type.startswith('uint') else -9999
+
+
+def tile_writer_options(mode):
+    """
+    writers.gdal options for a single band multiview tile
+    (the same the per-tile pipelines use).
+    """
+    data_type = "float32" if mode == 'elevation' else ("uint16_t" if mode != 'count' else "uint32_t")
+    return {
+        "output_type": "mean" if mode != 'count' else "count",
+        "dimension": ("Intensity" if mode == 'intensity' 
+                    else "Z" if mode == 'elevation'
+                    else "Intensity"),
+        "data_type": data_type,
+        "nodata": writer_nodata(data_type),
+        "gdalopts": GTIFF_FLOAT_OPTS if mode == 'elevation' else GTIFF_OPTS
+    }
+
+
+def rasterize_pointcloud_modes(las_file, outputs, resolution=0.1, preview=False):
+    """
+    Rasterize a point cloud in several single band modes at once. One reader
+    feeds a writers.gdal stage per mode, so the point cloud is decoded only
+    once no matter how many rasters are written.
+    
+    Args:
+        las_file: Input LAS/LAZ file path
+        outputs: Dictionary of mode ('intensity', 'elevation', 'count') -> output GeoTIFF file path
+        resolution: Pixel resolution in meters (default: 0.1)
+        preview: If True, sample the points first for faster, approximate images (see preview_stages)
+    
+    Returns:
+        (True, None) if successful, (False, error_message) otherwise
+    """
+    stages = [{
+        "type": "readers.las",
+        "filename": str(las_file),
+        "tag": "reader"
+    }]
+    # Modes that allow it read a sampled copy of the points, count reads them all
+    sampled = preview_stages(resolution, 'intensity') if preview else []
+    if sampled:
+        stages.append(dict(sampled[0], inputs=["reader"], tag="sampled"))
+    
+    for mode, output_file in outputs.items():
+        stages.append(dict({
+            "type": "writers.gdal",
+            "inputs": ["sampled" if sampled and mode != 'count' else "reader"],
+            "filename": str(output_file),
+            "resolution": resolution,
+            "radius": resolution
+        }, **tile_writer_options(mode)))
+    
+    success, error = run_pipeline({"pipeline": stages})
+    if not success:
+        error_msg = f"PDAL processing failed: {error}"
+        logger.error(error_msg)
         return False, error_msg
+    
+    for output_file in outputs.values():
+        size = file_size(output_file)
+        if not size:
+            error_msg = f"PDAL pipeline completed but output file was not created: {output_file}"
+            logger.error(error_msg)
+            return False, error_msg
+        logger.info(f"✓ Successfully created: {output_file} ({size} bytes)")
+    
+    return True, None
+
+
+def run_pipeline(pipeline_json):
+    """
+    Execute a PDAL pipeline, in-process when the PDAL Python bindings
+    are available, otherwise with the pdal command line tool.
+    Streamable pipelines run in stream mode either way, so points go
+    through in chunks instead of the whole cloud being held in memory.
+    
+    Returns:
+        (True, None) if successful, (False, error_message) otherwise
+    """
+    if pdal is not None:
+        try:
+            pipeline = pdal.Pipeline(json.dumps(pipeline_json))
+            with conversion_gdal_config():
+                if getattr(pipeline, 'streamable', False):
+                    pipeline.execute_streaming()
+                else:
+                    pipeline.execute()
+            return True, None
+        except RuntimeError as e:
+            return False, str(e)
+
+    try:
+        # The pipeline is passed on stdin, no JSON file needed.
+        # pdal pipeline picks stream mode by itself when every stage supports it
+        subprocess.run(["pdal", "pipeline", "--stdin"], input=json.dumps(pipeline_json),
+                      capture_output=True, check=True, text=True, env=gdal_env())
+        return True, None
+    except subprocess.CalledProcessError as e:
+        return False, e.stderr if e.stderr else str(e)
+
+
+def rgb_bands_pipeline(reader_stages, band_files, resolution):
+    """
+    PDAL pipeline writing the Red, Green and Blue dimensions of the points
+    produced by reader_stages to one 8-bit GeoTIFF each. All three writers
+    hang off the same reader, so the point cloud is decoded only once.
+    LAS colors are 16-bit; they're scaled to 8-bit per point before
+    rasterizing, which is cheaper than rescaling every pixel afterwards.
+    
+    Args:
+        reader_stages: Stages reading the points (see tile_reader_stages)
+        band_files: (red_tif, green_tif, blue_tif)
+    """
+    stages = [dict(stage) for stage in reader_stages]
+    stages.append({
+        "type": "filters.assign",
+        "value": ["Red = Red / 256", "Green = Green / 256", "Blue = Blue / 256"],
+        "tag": "points"
+    })
+    for dim, out_path in zip(("Red", "Green", "Blue"), band_files):
+        stages.append({
+            "type": "writers.gdal",
+            "inputs": ["points"],
+            "filename": str(out_path),
+            "resolution": resolution,
+            "radius": resolution,
+            "output_type": "mean",
+            "dimension": dim,
+            "data_type": "uint8_t",
+            "nodata": writer_nodata("uint8_t"),
+            "gdalopts": GTIFF_OPTS
+        })
+    return {"pipeline": stages}
+
+
+def can_stack_rgb_bands():
+    """Check if stack_rgb_bands() can run (GDAL bindings, rasterio or command line tools)."""
+    return gdal is not None or rasterio is not None or (gdal_tool_path('gdalbuildvrt') is not None and
+                                gdal_tool_path('gdal_translate') is not None)
+
+
+def stack_rgb_bands(band_files, output_file):
+    """
+    Combine single band 8-bit Red, Green and Blue GeoTIFFs (see rgb_bands_pipeline)
+    into an RGB GeoTIFF.
+    With the GDAL bindings the bands are stacked in an in-memory VRT and
+    converted in-process; with rasterio the bands are copied one at a time
+    into the output; otherwise gdalbuildvrt and gdal_translate are run
+    with a VRT file next to the output.
+    
+    Args:
+        band_files: (red_tif, green_tif, blue_tif)
+    
+    Raises:
+        RuntimeError: if the bands could not be combined
+    """
+    band_files = [str(f) for f in band_files]
+    creation_options = ["COMPRESS=DEFLATE", "PREDICTOR=2", "TILED=YES", "BLOCKXSIZE=512", "BLOCKYSIZE=512",
+                        "PHOTOMETRIC=RGB", "BIGTIFF=YES"]
+    
+    if gdal is not None:
+        with conversion_gdal_config():
+            vrt = gdal.BuildVRT('', band_files, separate=True)
+            ds = gdal.Translate(str(output_file), vrt, outputType=gdal.GDT_Byte, creationOptions=creation_options)
+            if ds is None:
+                raise RuntimeError(gdal.GetLastErrorMsg())
+            ds = vrt = None # Close and flush to disk
+        return
+    
+    if rasterio is not None:
+        try:
+            with rasterio.open(band_files[0]) as src:
+                profile = src.profile
+            profile.update(driver='GTiff', count=3, dtype='uint8', photometric='RGB',
+                           compress='deflate', predictor=2, tiled=True, blockxsize=512, blockysize=512,
+                           num_threads=gdal_num_threads(), bigtiff='yes')
+            # One band in memory at a time
+            with rasterio.open(output_file, 'w', **profile) as dst:
+                for index, band_file in enumerate(band_files, start=1):
+                    with rasterio.open(band_file) as src:
+                        dst.write(src.read(1), index)
+        except rasterio.errors.RasterioError as e:
+            raise RuntimeError(str(e))
+        return
+    
+    vrt_path = str(output_file).replace('.tif', '.vrt')
+    try:
+        subprocess.run([gdal_tool_path('gdalbuildvrt'), "-separate", vrt_path] + band_files,
+                       capture_output=True, check=True, text=True, env=gdal_env())
+        cmd = [gdal_tool_path('gdal_translate'), vrt_path, str(output_file),
+               "-ot", "Byte"]
+        for co in creation_options:
+            cmd += ["-co", co]
+        subprocess.run(cmd, capture_output=True, check=True, text=True, env=gdal_env())
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr if e.stderr else str(e))
+    finally:
+        if os.path.exists(vrt_path):
+            os.unlink(vrt_path)
+
+
+def crop_raster(source_file, output_file, bounds, resolution):
+    """
+    Cut the region within bounds out of a GeoTIFF, resampled (averaging)
+    to resolution. Cheaper than rasterizing the points of the region again.
+    
+    Args:
+        bounds: (min_x, min_y, max_x, max_y)
+    
+    Returns:
+        True if the region was written, False if it has no data (nothing is written)
+    
+    Raises:
+        RuntimeError: if the raster could not be cropped
+    """
+    min_x, min_y, max_x, max_y = bounds
+    
+    if gdal is not None:
+        src = gdal.Open(str(source_file))
+        
+        # Skip regions the points don't reach
+        gt = src.GetGeoTransform()
+        xoff = max(0, int((min_x - gt[0]) / gt[1]))
+        yoff = max(0, int((max_y - gt[3]) / gt[5]))
+        xsize = min(src.RasterXSize, math.ceil((max_x - gt[0]) / gt[1])) - xoff
+        ysize = min(src.RasterYSize, math.ceil((min_y - gt[3]) / gt[5])) - yoff
+        if xsize <= 0 or ysize <= 0:
+            return False
+        if not src.GetRasterBand(1).GetMaskBand().ReadAsArray(xoff, yoff, xsize, ysize).any():
+            return False
+        
+        is_float = src.GetRasterBand(1).DataType in (gdal.GDT_Float32, gdal.GDT_Float64)
+        creation_options = (GTIFF_FLOAT_OPTS if is_float else GTIFF_OPTS).split(',')
+        if src.RasterCount == 3:
+            creation_options.append("PHOTOMETRIC=RGB")
+        with conversion_gdal_config():
+            ds = gdal.Translate(str(output_file), src, projWin=[min_x, max_y, max_x, min_y],
+                                xRes=resolution, yRes=resolution, resampleAlg='average',
+                                creationOptions=creation_options)
+            if ds is None:
+                raise RuntimeError(gdal.GetLastErrorMsg())
+            ds = src = None # Close and flush to disk
+        return True
+    
+    if rasterio is None:
+        raise RuntimeError("Cropping rasters requires the GDAL Python bindings or rasterio")
+    
+    try:
+        with rasterio.open(source_file) as src:
+            width = max(1, round((max_x - min_x) / resolution))
+            height = max(1, round((max_y - min_y) / resolution))
+            window = rasterio.windows.from_bounds(min_x, min_y, max_x, max_y, src.transform)
+            # Skip regions the points don't reach
+            if src.read(1, window=window, masked=True).count() == 0:
+                return False
+            data = src.read(window=window, out_shape=(src.count, height, width),
+                            resampling=Resampling.average)
+            is_float = src.dtypes[0].startswith('float')
+            profile = src.profile
+        
+        profile.update(driver='GTiff', width=width, height=height,
+                       transform=rasterio.transform.from_bounds(min_x, min_y, max_x, max_y, width, height))
+        for option in (GTIFF_FLOAT_OPTS if is_float else GTIFF_OPTS).split(','):
+            key, value = option.split('=')
+            profile[key.lower()] = value
+        profile['num_threads'] = gdal_num_threads()
+        if profile['count'] == 3:
+            profile['photometric'] = 'RGB'
+        with rasterio.open(output_file, 'w', **profile) as dst:
+            dst.write(data)
+        return True
+    except rasterio.errors.RasterioError as e:
+        raise RuntimeError(str(e))
+
+
+def raster_has_data(path):
+    """
+    Check whether the first band of a raster has any valid pixel, going by
+    its mask band rather than comparing values with the nodata value (which
+    may not even be representable in the band's data type, see writer_nodata).
+    Rasters that can't be inspected (no GDAL bindings nor rasterio, or
+    unreadable) are assumed to.
+    """
+    try:
+        if gdal is not None:
+            ds = gdal.Open(str(path))
+            return bool(ds.GetRasterBand(1).GetMaskBand().ReadAsArray().any())
+        if rasterio is not None:
+            with rasterio.open(path) as src:
+                return src.read(1, masked=True).count() > 0
+    except (RuntimeError, OSError) as e:
+        logger.warning(f"  Could not inspect {path}: {e}")
+    return True
+
+
+def remove_empty_rasters(paths):
+    """
+    Delete the rasters without any data (see raster_has_data) among paths.
+    
+    Returns:
+        Set of the deleted paths
+    """
+    empty = {p for p in paths if file_size(p) and not raster_has_data(p)}
+    remove_files(empty)
+    return empty
+
+
+def create_tiles_pipeline(las_file, tiles, resolution, mode):
+    """
+    Rasterize all multiview tiles with one PDAL pipeline: a single reader
+    feeds one filters.crop -> writers.gdal branch per tile, so the point
+    cloud is read once rather than once per tile.
+    Writers get fixed bounds, so a tile without points writes an empty raster
+    instead of failing the whole pipeline; those rasters are then deleted.
+    
+    Args:
+        tiles: list of (row, col, minx, miny, maxx, maxy, output_file)
+    
+    Returns:
+        (success, empty) where success tells whether the pipeline completed
+        and empty is the set of output files skipped for having no points
+    """
+    stages = [{
+        "type": "readers.las",
+        "filename": str(las_file),
+        "tag": "reader"
+    }]
+    writer_options = tile_writer_options(mode)
+    
+    for i, (row, col, tile_minx, tile_miny, tile_maxx, tile_maxy, output_file) in enumerate(tiles):
+        bounds = f"([{tile_minx},{tile_maxx}],[{tile_miny},{tile_maxy}])"
+        stages.append({
+            "type": "filters.crop",
+            "inputs": ["reader"],
+            "bounds": bounds,
+            "tag": f"crop_{i}"
+        })
+        stages.append(dict({
+            "type": "writers.gdal",
+            "inputs": [f"crop_{i}"],
+            "filename": str(output_file),
+            "resolution": resolution,
+            "radius": resolution,
+            "bounds": bounds
+        }, **writer_options))
+    
+    success, error = run_pipeline({"pipeline": stages})
+    if not success:
+        logger.warning(f"  Single pipeline tiling failed: {error}")
+        return False, set()
+    
+    return True, remove_empty_rasters([t[-1] for t in tiles])
+
+
+def should_build_copc(point_count, tile_count):
+    """
+    Whether indexing a point cloud of point_count points with build_copc is
+    worth it for tile_count per-tile pipelines (see COPC_MAX_POINTS).
+    Clouds of unknown size are left alone.
+    """
+    return tile_count >= COPC_MIN_TILES and 0 < (point_count or 0) <= COPC_MAX_POINTS
+
+
+def build_copc(las_file, directory):
+    """
+    Write a COPC (octree ordered, cloud optimized) copy of a point cloud
+    into directory, so that tile pipelines can fetch just the points within
+    their bounds instead of decoding the whole file every time.
+    Unlike the tile pipelines this loads the whole point cloud into memory,
+    see should_build_copc. The input's own directory is left untouched; removing the copy once
+    the tiles are done is up to the caller.
+    
+    Returns:
+        Path to the COPC file (las_file itself if it's already COPC),
+        or None if it couldn't be created
+    """
+    las_file = Path(las_file)
+    if las_file.name.lower().endswith('.copc.laz'):
+        return las_file
+    
+    logger.info("Building COPC index...")
+    copc_file = Path(directory) / f"{las_file.stem}.copc.laz"
+    success, error = run_pipeline({
+        "pipeline": [
+            {"type": "readers.las", "filename": str(las_file)},
+            {"type": "writers.copc", "filename": str(copc_file)}
+        ]
+    })
+    if not success:
+        logger.warning(f"  Could not build COPC index ({error}), tiles will read the whole file")
+        remove_files([copc_file])
+        return None
+    
+    return copc_file
+
+
+def tile_reader_stages(las_file, bounds, copc_file=None):
+    """
+    PDAL stages reading the points of a point cloud within bounds.
+    With a COPC copy only the octree nodes overlapping bounds are decoded,
+    otherwise the whole file is read and cropped.
+    
+    Args:
+        bounds: (minx, miny, maxx, maxy)
+        copc_file: Optional COPC copy of las_file (see build_copc)
+    """
+    minx, miny, maxx, maxy = bounds
+    bounds = f"([{minx},{maxx}],[{miny},{maxy}])"
+    if copc_file is not None:
+        return [{"type": "readers.copc", "filename": str(copc_file), "bounds": bounds}]
+    return [
+        {"type": "readers.las", "filename": str(las_file)},
+        {"type": "filters.crop", "bounds": bounds}
+    ]
+
+
+def grid_dimension(extent, tile_size, step):
+    """
+    Number of tiles of tile_size, placed every step, needed to cover extent
+    (all in meters). Counted in whole millimeters so that float rounding
+    can't add (or drop) a sliver column or row, and only as many tiles as
+    needed to reach the far edge: a tile starting past (extent - tile_size)
+    would be clamped to a subset of its neighbour.
+    """
+    step_mm = int(round(step * 1000))
+    if step_mm <= 0:
+        return 1
+    tile_mm = int(round(tile_size * 1000))
+    return 1 + max(0, -(-(int(round(extent * 1000)) - tile_mm) // step_mm))
+
+
+def create_tile(las_file, tile, resolution, mode, copc_file=None):
+    """
+    Rasterize a single multiview tile with its own PDAL pipeline(s).
+    
+    Args:
+        tile: (row, col, minx, miny, maxx, maxy, output_file)
+        copc_file: Optional COPC copy of las_file (see build_copc) to read
+                   only the points of the tile from
+    
+    Returns:
+        True if the tile was created, False otherwise
+    """
+    row, col, tile_minx, tile_miny, tile_maxx, tile_maxy, output_file = tile
+    reader_stages = tile_reader_stages(las_file, (tile_minx, tile_miny, tile_maxx, tile_maxy), copc_file)
+    data_type = "float32" if mode == 'elevation' else ("uint16_t" if mode != 'count' else "uint32_t")
+    
+    # Create cropped raster
+    try:
+        pipeline_json = {
+            "pipeline": [
+                *reader_stages,
+                {
+                    "type": "writers.gdal",
+                    "filename": str(output_file),
+                    "resolution": resolution,
+                    "radius": resolution,
+                    "output_type": "mean" if mode != 'count' else "count",
+                    "dimension": ("Intensity" if mode == 'intensity' 
+                                else "Z" if mode == 'elevation'
+                                else mode.capitalize() if mode in ['Red', 'Green', 'Blue']
+                                else "Intensity"),
+                    "data_type": data_type,
+                    "nodata": writer_nodata(data_type),
+                    "gdalopts": GTIFF_FLOAT_OPTS if mode == 'elevation' else GTIFF_OPTS
+                }
+            ]
+        }
+
+        # Handle RGB mode specially - create proper 3-band RGB
+        if mode == 'rgb':
+            # Create separate R, G, B bands then combine with GDAL
+            red_tif = str(output_file).replace('.tif', '_red.tif')
+            green_tif = str(output_file).replace('.tif', '_green.tif')
+            blue_tif = str(output_file).replace('.tif', '_blue.tif')
+
+            try:
+                success, error = run_pipeline(rgb_bands_pipeline(reader_stages, (red_tif, green_tif, blue_tif), resolution))
+                if not success:
+                    raise Exception(error)
+
+                # Combine with GDAL
+                if can_stack_rgb_bands():
+                    stack_rgb_bands((red_tif, green_tif, blue_tif), output_file)
+
+                    # Clean up temp files
+                    remove_files([red_tif, green_tif, blue_tif])
+                    return True  # Skip normal pipeline processing
+                else:
+                    # Fallback: use single band
+                    shutil.move(red_tif, str(output_file))
+                    remove_files([green_tif, blue_tif])
+                    return True  # Skip normal pipeline processing
+            except Exception as e:
+                logger.warning(f"  RGB processing failed for tile, using intensity: {e}")
+                # Fallback to intensity - modify pipeline_json and continue with normal processing
+                pipeline_json = {
+                    "pipeline": [
+                        *reader_stages,
+                        {
+                            "type": "writers.gdal",
+                            "filename": str(output_file),
+                            "resolution": resolution,
+                            "radius": resolution,
+                            "output_type": "mean",
+                            "dimension": "Intensity",
+                            "gdalopts": GTIFF_OPTS
+                        }
+                    ]
+                }
+                # Continue with normal pipeline processing below
+
+        success, error = run_pipeline(pipeline_json)
+        if not success:
+            raise RuntimeError(error)
+        return True
+
+    except Exception as e:
+        logger.warning(f"  Failed to create tile: {e}")
+        return False
 
 
 def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensity', 
@@ -321,12 +983,11 @@ def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensit
     """
     las_file = Path(las_file)
     output_dir = Path(output_dir)
-    import shutil
     
     # Get point cloud bounds
     info = get_las_info(las_file)
     if not info or 'bounds' not in info:
-        print("ERROR: Could not read point cloud bounds")
+        logger.error("Could not read point cloud bounds")
         return False
     
     bounds = info['bounds']
@@ -340,8 +1001,8 @@ def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensit
     if tile_size > max(width, height):
         old_tile_size = tile_size
         tile_size = max(width, height) * 0.4  # Use 40% of the largest dimension
-        print(f"Note: Tile size ({old_tile_size}m) is larger than point cloud ({max(width, height):.2f}m)")
-        print(f"      Auto-adjusting tile size to {tile_size:.2f}m for better tiling")
+        logger.info(f"Note: Tile size ({old_tile_size}m) is larger than point cloud ({max(width, height):.2f}m), "
+                    f"auto-adjusting tile size to {tile_size:.2f}m for better tiling")
     
     # If count is specified, adjust tile_size to achieve approximately that many images
     if count and count > 0:
@@ -361,29 +1022,29 @@ def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensit
             calculated_tile_size = max(10, min(calculated_tile_size, max(width, height) * 0.9))
             
             if abs(calculated_tile_size - tile_size) > 1:  # Only adjust if significantly different
-                print(f"Note: Adjusting tile size from {tile_size:.2f}m to {calculated_tile_size:.2f}m")
-                print(f"      to achieve approximately {count} images")
+                logger.info(f"Note: Adjusting tile size from {tile_size:.2f}m to {calculated_tile_size:.2f}m "
+                            f"to achieve approximately {count} images")
                 tile_size = calculated_tile_size
     
-    print(f"Point cloud bounds: {width:.2f}m x {height:.2f}m")
-    print(f"Creating tiles: {tile_size:.2f}m with {overlap*100}% overlap")
+    logger.info(f"Point cloud bounds: {width:.2f}m x {height:.2f}m")
+    logger.info(f"Creating tiles: {tile_size:.2f}m with {overlap*100}% overlap")
     
     # Calculate tile step (with overlap)
     step = tile_size * (1 - overlap)
     
     # Calculate grid
-    cols = math.ceil(width / step) if step > 0 else 1
-    rows = math.ceil(height / step) if step > 0 else 1
+    cols = grid_dimension(width, tile_size, step)
+    rows = grid_dimension(height, tile_size, step)
     
     total_images = cols * rows
-    print(f"Grid: {cols} columns x {rows} rows = {total_images} images")
+    logger.info(f"Grid: {cols} columns x {rows} rows = {total_images} images")
     if count:
-        print(f"Target was {count} images, generating {total_images} images")
-    print()
+        logger.info(f"Target was {count} images, generating {total_images} images")
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    created_count = 0
+    base_name = las_file.stem
+    tiles = []
     for row in range(rows):
         for col in range(cols):
             # Calculate tile bounds
@@ -398,133 +1059,268 @@ def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensit
             tile_maxx = min(maxx, tile_maxx)
             tile_maxy = min(maxy, tile_maxy)
             
-            if tile_maxx <= tile_minx or tile_maxy <= tile_miny:
+            if tile_maxx - tile_minx < 1e-6 or tile_maxy - tile_miny < 1e-6:
                 continue
             
             # Create filename
-            base_name = las_file.stem
             output_file = output_dir / f"{base_name}_{mode}_tile_r{row:02d}_c{col:02d}.tif"
-            
-            print(f"Creating tile [{row+1}/{rows}, {col+1}/{cols}]: {output_file.name}")
-            
-            # Create cropped raster
-            try:
-                pipeline_json = {
-                    "pipeline": [
-                        {
-                            "type": "readers.las",
-                            "filename": str(las_file)
-                        },
-                        {
-                            "type": "filters.crop",
-                            "bounds": f"([{tile_minx},{tile_maxx}],[{tile_miny},{tile_maxy}])"
-                        },
-                        {
-                            "type": "writers.gdal",
-                            "filename": str(output_file),
-                            "resolution": resolution,
-                            "radius": resolution,
-                            "output_type": "mean" if mode != 'count' else "count",
-                            "dimension": ("Intensity" if mode == 'intensity' 
-                                        else "Z" if mode == 'elevation'
-                                        else mode.capitalize() if mode in ['Red', 'Green', 'Blue']
-                                        else "Intensity"),
-                            "data_type": "float32" if mode == 'elevation' else ("uint16_t" if mode != 'count' else "uint32_t"),
-                            "gdalopts": "COMPRESS=DEFLATE,BIGTIFF=YES" if mode == 'elevation' else "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                        }
-                    ]
+            tiles.append((row, col, tile_minx, tile_miny, tile_maxx, tile_maxy, output_file))
+    
+    created_count = 0
+    
+    # Single band modes: read the point cloud once and crop/write
+    # every tile from the same pipeline instead of re-reading it per tile
+    if mode != 'rgb' and len(tiles) > 1:
+        logger.info(f"Creating {len(tiles)} tiles in a single pipeline...")
+        _, empty = create_tiles_pipeline(las_file, tiles, resolution, mode)
+        if empty:
+            logger.info(f"  Skipping {len(empty)} tiles with no points")
+        
+        # Whatever the single pipeline didn't produce is created per tile below
+        missing = [t for t in tiles if t[-1] not in empty and not file_size(t[-1])]
+        created_count = len(tiles) - len(empty) - len(missing)
+        if missing:
+            logger.warning(f"  {len(missing)} tiles were not created, retrying them individually")
+        tiles = missing
+    
+    # Tiles are independent. Each worker runs its pipeline in this process through
+    # the PDAL bindings (a pdal subprocess without them), streaming the points
+    # (only its own ones with a COPC index), so use the CPUs this process may run on.
+    if tiles:
+        # Index the cloud once so each tile only decodes its own points, when it fits in memory.
+        # The index is scratch data: keep it out of the input's directory and drop it afterwards
+        use_copc = should_build_copc(info.get('count'), len(tiles))
+        copc_dir = tempfile.mkdtemp(prefix="copc_", dir=output_dir) if use_copc else None
+        try:
+            copc_file = build_copc(las_file, copc_dir) if copc_dir else None
+            
+            max_workers = min(len(tiles), available_cpus())
+            with ThreadPoolExecutor(max_workers=max_workers, initializer=limit_gdal_threads,
+                                    initargs=(max_workers,)) as executor:
+                futures = []
+                for tile in tiles:
+                    row, col, output_file = tile[0], tile[1], tile[-1]
+                    logger.info(f"Creating tile [{row+1}/{rows}, {col+1}/{cols}]: {output_file.name}")
+                    futures.append(executor.submit(create_tile, las_file, tile, resolution, mode, copc_file))
+                for future in as_completed(futures):
+                    if future.result():
+                        created_count += 1
+        finally:
+            if copc_dir:
+                shutil.rmtree(copc_dir, ignore_errors=True)
+
+    logger.info(f"✓ Successfully created {created_count} tile images!")
+    logger.info(f"  You can now upload all images from {output_dir} to WebODM")
+    return created_count > 0
+
+
+def create_views_pipeline(las_file, views, mode):
+    """
+    Rasterize all perspective views with one PDAL pipeline: a single reader
+    feeds one filters.crop -> writers.gdal branch per view, so the point
+    cloud is read once rather than once per view. In RGB mode each branch
+    writes the three bands, which are then stacked per view.
+    As with create_tiles_pipeline, views without points are skipped
+    rather than failing the whole pipeline.
+    
+    Args:
+        views: list of create_view arguments
+    
+    Returns:
+        (success, empty) where success tells whether the pipeline completed
+        and empty is the set of indexes of the views skipped for having no points
+    """
+    stages = [{
+        "type": "readers.las",
+        "filename": str(las_file),
+        "tag": "reader"
+    }]
+    source = "reader"
+    if mode == 'rgb':
+        # Scale colors to 8-bit once, before the points are split into views
+        stages.append({
+            "type": "filters.assign",
+            "inputs": ["reader"],
+            "value": ["Red = Red / 256", "Green = Green / 256", "Blue = Blue / 256"],
+            "tag": "points"
+        })
+        source = "points"
+    else:
+        writer_options = tile_writer_options(mode)
+    
+    for _, output_file, (view_min_x, view_min_y, view_max_x, view_max_y), _, view_resolution, _, i in views:
+        bounds = f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
+        stages.append({
+            "type": "filters.crop",
+            "inputs": [source],
+            "bounds": bounds,
+            "tag": f"crop_{i}"
+        })
+        if mode == 'rgb':
+            for dim in ("Red", "Green", "Blue"):
+                stages.append({
+                    "type": "writers.gdal",
+                    "inputs": [f"crop_{i}"],
+                    "filename": str(output_file.with_name(f"{output_file.stem}_{dim.lower()}.tif")),
+                    "resolution": view_resolution,
+                    "radius": view_resolution,
+                    "bounds": bounds,
+                    "output_type": "mean",
+                    "dimension": dim,
+                    "data_type": "uint8_t",
+                    "nodata": writer_nodata("uint8_t"),
+                    "gdalopts": GTIFF_OPTS
+                })
+        else:
+            stages.append(dict({
+                "type": "writers.gdal",
+                "inputs": [f"crop_{i}"],
+                "filename": str(output_file),
+                "resolution": view_resolution,
+                "radius": view_resolution,
+                "bounds": bounds
+            }, **writer_options))
+    
+    success, error = run_pipeline({"pipeline": stages})
+    if not success:
+        logger.warning(f"  Single pipeline rendering failed: {error}")
+    
+    empty = set()
+    if mode == 'rgb':
+        for view in views:
+            output_file = view[1]
+            band_files = [output_file.with_name(f"{output_file.stem}_{c}.tif") for c in ("red", "green", "blue")]
+            if success and all(file_size(f) for f in band_files):
+                if not raster_has_data(band_files[0]):
+                    empty.add(view[-1])
+                elif can_stack_rgb_bands():
+                    try:
+                        stack_rgb_bands(band_files, output_file)
+                    except RuntimeError as e:
+                        logger.warning(f"  GDAL RGB combination failed: {e}")
+            remove_files(band_files)
+    elif success:
+        empty_files = remove_empty_rasters([view[1] for view in views])
+        empty = {view[-1] for view in views if view[1] in empty_files}
+    
+    return success, empty
+
+
+def create_view(las_file, output_file, view_bounds, resolution, view_resolution, mode, index):
+    """
+    Rasterize a single perspective view (see create_perspective_views).
+    
+    Args:
+        output_file: Output GeoTIFF file path
+        view_bounds: (min_x, min_y, max_x, max_y) of the region covered by the view
+        resolution: Base pixel resolution in meters (used by the intensity fallbacks)
+        view_resolution: Pixel resolution of this view in meters
+        index: Index of the view, for messages
+    
+    Returns:
+        True if the view was created, False otherwise
+    """
+    i = index
+    view_min_x, view_min_y, view_max_x, view_max_y = view_bounds
+    output_dir = output_file.parent
+    base_name = output_file.stem
+    created = False
+    
+    try:
+        # Create a rotated view by transforming coordinates
+        # We'll create a bounding box that's rotated to this view angle
+        # For simplicity, we'll use the full bounds but the view will be from a different angle
+        
+        # Create PDAL pipeline that creates an orthographic view
+        # Since PDAL doesn't support true perspective, we'll create views
+        # from different positions by cropping/rotating the data
+        
+        if mode == 'rgb':
+            # RGB mode - create 3 separate bands and combine
+            red_tif = output_dir / f"{base_name}_red.tif"
+            green_tif = output_dir / f"{base_name}_green.tif"
+            blue_tif = output_dir / f"{base_name}_blue.tif"
+            
+            reader_stages = [
+                {
+                    "type": "readers.las",
+                    "filename": str(las_file)
                 }
+            ]
+            
+            # Add crop filter to focus on different region
+            if view_min_x < view_max_x and view_min_y < view_max_y:
+                reader_stages.append({
+                    "type": "filters.crop",
+                    "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
+                })
+            
+            # All three bands come from a single pipeline
+            rgb_success, error = run_pipeline(rgb_bands_pipeline(reader_stages, (red_tif, green_tif, blue_tif), view_resolution))
+            if not rgb_success:
+                logger.warning(f"  Failed to create RGB bands: {error if error else 'Unknown error'}")
+            else:
+                # Check if the files were created and have non-zero size
+                for dim, temp_file in [("Red", red_tif), ("Green", green_tif), ("Blue", blue_tif)]:
+                    if not file_size(temp_file):
+                        logger.warning(f"  {dim} band file is empty or missing, falling back to intensity")
+                        rgb_success = False
+                        break
+            
+            if not rgb_success:
+                # Fallback to intensity mode
+                logger.info(f"  Falling back to intensity mode for view {i+1}")
+                pipeline_stages = [
+                    {
+                        "type": "readers.las",
+                        "filename": str(las_file)
+                    }
+                ]
                 
-                # Handle RGB mode specially - create proper 3-band RGB
-                if mode == 'rgb':
-                    # Create separate R, G, B bands then combine with GDAL
-                    red_tif = str(output_file).replace('.tif', '_red.tif')
-                    green_tif = str(output_file).replace('.tif', '_green.tif')
-                    blue_tif = str(output_file).replace('.tif', '_blue.tif')
-                    
-                    def create_rgb_band(out_path, dim):
-                        pj = {
-                            "pipeline": [
-                                {
-                                    "type": "readers.las",
-                                    "filename": str(las_file)
-                                },
-                                {
-                                    "type": "filters.crop",
-                                    "bounds": f"([{tile_minx},{tile_maxx}],[{tile_miny},{tile_maxy}])"
-                                },
-                                {
-                                    "type": "writers.gdal",
-                                    "filename": str(out_path),
-                                    "resolution": resolution,
-                                    "radius": resolution,
-                                    "output_type": "mean",
-                                    "dimension": dim,
-                                    "data_type": "uint16_t",
-                                    "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                                }
-                            ]
-                        }
-                        pf_temp = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-                        json.dump(pj, pf_temp)
-                        pf_temp.close()
-                        try:
-                            subprocess.run(["pdal", "pipeline", pf_temp.name],
-                                          capture_output=True, check=True, text=True)
-                        finally:
-                            if os.path.exists(pf_temp.name):
-                                os.unlink(pf_temp.name)
+                # Add crop filter for spatial diversity
+                if view_min_x < view_max_x and view_min_y < view_max_y:
+                    pipeline_stages.append({
+                        "type": "filters.crop",
+                        "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
+                    })
+                
+                pipeline_stages.append({
+                    "type": "writers.gdal",
+                    "filename": str(output_file),
+                    "resolution": view_resolution,
+                    "radius": view_resolution,
+                    "output_type": "mean",
+                    "dimension": "Intensity",
+                    "gdalopts": GTIFF_OPTS
+                })
+                
+                pipeline_json = {"pipeline": pipeline_stages}
+                
+                success, error = run_pipeline(pipeline_json)
+                if not success:
+                    raise RuntimeError(error)
+                created = True
+                # Clean up any partial RGB files
+                remove_files([red_tif, green_tif, blue_tif])
+                return created
+            
+            # Combine RGB bands using GDAL
+            if can_stack_rgb_bands():
+                try:
+                    stack_rgb_bands((red_tif, green_tif, blue_tif), output_file)
                     
-                    try:
-                        create_rgb_band(red_tif, "Red")
-                        create_rgb_band(green_tif, "Green")
-                        create_rgb_band(blue_tif, "Blue")
-                        
-                        # Combine with GDAL
-                        gdalbuildvrt = shutil.which('gdalbuildvrt')
-                        gdal_translate = shutil.which('gdal_translate')
-                        if gdalbuildvrt and gdal_translate:
-                            vrt_path = str(output_file).replace('.tif', '.vrt')
-                            subprocess.run([gdalbuildvrt, "-separate", vrt_path, red_tif, green_tif, blue_tif],
-                                         capture_output=True, check=True, text=True)
-                            subprocess.run([
-                                gdal_translate, vrt_path, str(output_file),
-                                "-ot", "Byte",
-                                "-scale", "0", "65535", "0", "255",
-                                "-co", "COMPRESS=DEFLATE",
-                                "-co", "PREDICTOR=2",
-                                "-co", "PHOTOMETRIC=RGB",
-                                "-co", "BIGTIFF=YES"
-                            ], capture_output=True, check=True, text=True)
-                            
-                            # Clean up temp files
-                            for f in [red_tif, green_tif, blue_tif, vrt_path]:
-                                if os.path.exists(f):
-                                    os.unlink(f)
-                            created_count += 1
-                            continue  # Skip normal pipeline processing
-                        else:
-                            # Fallback: use single band
-                            import shutil as sh
-                            sh.move(red_tif, str(output_file))
-                            for f in [green_tif, blue_tif]:
-                                if os.path.exists(f):
-                                    os.unlink(f)
-                            created_count += 1
-                            continue  # Skip normal pipeline processing
-                    except Exception as e:
-                        print(f"  Warning: RGB processing failed for tile, using intensity: {e}")
-                        # Fallback to intensity - modify pipeline_json and continue with normal processing
+                    # Verify the output file is not empty/black
+                    if file_size(output_file):
+                        created = True
+                    else:
+                        logger.warning("  Output RGB file is empty, falling back to intensity")
+                        # Fallback to intensity
                         pipeline_json = {
                             "pipeline": [
                                 {
                                     "type": "readers.las",
                                     "filename": str(las_file)
                                 },
-                                {
-                                    "type": "filters.crop",
-                                    "bounds": f"([{tile_minx},{tile_maxx}],[{tile_miny},{tile_maxy}])"
-                                },
                                 {
                                     "type": "writers.gdal",
                                     "filename": str(output_file),
@@ -532,31 +1328,163 @@ def create_multiview_images(las_file, output_dir, resolution=0.1, mode='intensit
                                     "radius": resolution,
                                     "output_type": "mean",
                                     "dimension": "Intensity",
-                                    "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
+                                    "gdalopts": GTIFF_OPTS
                                 }
                             ]
                         }
-                        # Continue with normal pipeline processing below
-                
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                    json.dump(pipeline_json, f)
-                    pipeline_file = f.name
+                        success, error = run_pipeline(pipeline_json)
+                        if not success:
+                            raise RuntimeError(error)
+                        created = True
+                except RuntimeError as e:
+                    logger.warning(f"  GDAL RGB combination failed: {e}")
+                    # Fallback to intensity
+                    pipeline_json = {
+                        "pipeline": [
+                            {
+                                "type": "readers.las",
+                                "filename": str(las_file)
+                            },
+                            {
+                                "type": "writers.gdal",
+                                "filename": str(output_file),
+                                "resolution": resolution,
+                                "radius": resolution,
+                                "output_type": "mean",
+                                "dimension": "Intensity",
+                                "gdalopts": GTIFF_OPTS
+                            }
+                        ]
+                    }
+                    success, error = run_pipeline(pipeline_json)
+                    if not success:
+                        raise RuntimeError(error)
+                    created = True
                 
-                try:
-                    subprocess.run(["pdal", "pipeline", pipeline_file],
-                                  capture_output=True, check=True, text=True)
-                    created_count += 1
-                finally:
-                    if os.path.exists(pipeline_file):
-                        os.unlink(pipeline_file)
-                        
-            except Exception as e:
-                print(f"  Warning: Failed to create tile: {e}")
-                continue
+                # Clean up temp files
+                remove_files([red_tif, green_tif, blue_tif])
+                return created
+            else:
+                # GDAL tools not available - fallback to intensity
+                logger.warning("  GDAL tools not available, falling back to intensity")
+                remove_files([red_tif, green_tif, blue_tif])
+                pipeline_json = {
+                    "pipeline": [
+                        {
+                            "type": "readers.las",
+                            "filename": str(las_file)
+                        },
+                        {
+                            "type": "writers.gdal",
+                            "filename": str(output_file),
+                            "resolution": resolution,
+                            "radius": resolution,
+                            "output_type": "mean",
+                            "dimension": "Intensity",
+                            "gdalopts": GTIFF_OPTS
+                        }
+                    ]
+                }
+                success, error = run_pipeline(pipeline_json)
+                if not success:
+                    raise RuntimeError(error)
+                created = True
+                return created
+        else:
+            # Non-RGB modes: intensity, elevation, count
+            dimension_name = (
+                "Z" if mode == 'elevation'
+                else "Intensity" if mode == 'intensity'
+                else "Intensity"  # Default fallback
+            )
+            
+            # Set appropriate data type and gdalopts based on dimension
+            if mode == 'elevation':
+                data_type = "float32"
+                gdalopts = GTIFF_FLOAT_OPTS  # Floating point predictor for float32
+            elif mode == 'intensity':
+                data_type = "uint16_t"
+                gdalopts = GTIFF_OPTS
+            elif mode == 'count':
+                data_type = "uint32_t"
+                gdalopts = GTIFF_OPTS
+            else:
+                data_type = "uint16_t"
+                gdalopts = GTIFF_OPTS
+            
+            # Build pipeline with crop filter for spatial diversity
+            pipeline_stages = [
+                {
+                    "type": "readers.las",
+                    "filename": str(las_file)
+                }
+            ]
+            
+            # Add crop filter to focus on different region
+            if view_min_x < view_max_x and view_min_y < view_max_y:
+                pipeline_stages.append({
+                    "type": "filters.crop",
+                    "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
+                })
+            
+            pipeline_stages.append({
+                "type": "writers.gdal",
+                "filename": str(output_file),
+                "resolution": view_resolution,
+                "radius": view_resolution,
+                "output_type": "mean" if mode != 'count' else "count",
+                "dimension": dimension_name,
+                "data_type": data_type,
+                "nodata": writer_nodata(data_type),
+                "gdalopts": gdalopts
+            })
+            
+            pipeline_json = {"pipeline": pipeline_stages}
+            
+            success, error = run_pipeline(pipeline_json)
+            if not success:
+                logger.error(f"  ✗ Error creating view {i+1}: {error}")
+                return created
+            
+            # Verify the output file was created and is not empty
+            size = file_size(output_file)
+            if size is not None:
+                if size > 0:
+                    # Check if file has actual data (not just black)
+                    try:
+                        if rasterio is None:
+                            raise ImportError("rasterio")
+                        with rasterio.open(output_file) as src:
+                            # A decimated read is plenty for a sanity check; taking the
+                            # max of each block keeps sparse non-zero pixels visible
+                            factor = max(1, math.ceil(max(src.width, src.height) / VERIFY_MAX_DIM))
+                            data = src.read(1, out_shape=(max(1, src.height // factor), max(1, src.width // factor)),
+                                            resampling=Resampling.max)
+                            min_val = float(data.min())
+                            max_val = float(data.max())
+                            mean_val = float(data.mean())
+                            if max_val == 0 and min_val == 0:
+                                logger.warning(f"  ⚠ View {i+1} is all zeros (black) - check if {dimension_name} dimension exists in LAS file")
+                            else:
+                                logger.info(f"  ✓ Created view {i+1}: {output_file.name} ({size} bytes, values: {min_val:.1f}-{max_val:.1f}, mean: {mean_val:.1f})")
+                                created = True
+                    except ImportError:
+                        # rasterio not available, just check file size
+                        created = True
+                        logger.info(f"  ✓ Created view {i+1}: {output_file.name} ({size} bytes)")
+                    except Exception as e:
+                        logger.warning(f"  ⚠ Could not verify view {i+1} data: {e}")
+                        created = True
+                else:
+                    logger.warning(f"  ✗ View {i+1} file is empty (0 bytes)")
+            else:
+                logger.warning(f"  ✗ View {i+1} file was not created")
+                    
+    except Exception as e:
+        logger.warning(f"  Failed to create view {i+1}: {e}")
+        return False
     
-    print(f"\n✓ Successfully created {created_count} tile images!")
-    print(f"  You can now upload all images from {output_dir} to WebODM")
-    return created_count > 0
+    return created
 
 
 def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensity', count=30):
@@ -582,51 +1510,34 @@ def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensi
     # Get point cloud bounds and center
     info = get_las_info(las_file)
     if not info or 'bounds' not in info:
-        print("ERROR: Could not read point cloud bounds")
+        logger.error("Could not read point cloud bounds")
         return False
     
     # Debug: Print point cloud info
-    print(f"\n=== Point Cloud Information ===")
-    print(f"File: {las_file}")
+    logger.info("=== Point Cloud Information ===")
+    logger.info(f"File: {las_file}")
     if 'count' in info:
-        print(f"Point count: {info['count']:,}")
+        logger.info(f"Point count: {info['count']:,}")
     if 'stats' in info:
         stats = info['stats']
-        print(f"Available dimensions: {list(stats.keys()) if isinstance(stats, dict) else 'N/A'}")
-    print(f"Bounds: {info.get('bounds', {})}")
-    print(f"===============================\n")
+        logger.info(f"Available dimensions: {list(stats.keys()) if isinstance(stats, dict) else 'N/A'}")
+    logger.info(f"Bounds: {info.get('bounds', {})}")
+    logger.info("===============================")
     
     # Check if RGB dimensions exist in the point cloud
     # PDAL info includes dimension information
     has_rgb = False
     if mode == 'rgb':
-        # Check if file has RGB by trying to read a sample
-        try:
-            # Use PDAL info to check dimensions
-            result = subprocess.run(
-                ["pdal", "info", "--metadata", str(las_file)],
-                capture_output=True,
-                check=True,
-                text=True
-            )
-            metadata = json.loads(result.stdout)
-            # Check if Red, Green, Blue are in the dimensions
-            if 'metadata' in metadata:
-                for key in metadata['metadata']:
-                    if 'Red' in str(key) or 'Green' in str(key) or 'Blue' in str(key):
-                        has_rgb = True
-                        break
-            # Alternative: check if dimensions list includes RGB
-            if not has_rgb and 'metadata' in metadata:
-                dims_str = str(metadata.get('metadata', {}))
-                if 'Red' in dims_str and 'Green' in dims_str and 'Blue' in dims_str:
-                    has_rgb = True
-        except:
-            pass
+        # The summary already lists the dimensions, no need to read the metadata
+        dimensions = info.get('dimensions', '')
+        if isinstance(dimensions, str):
+            dimensions = dimensions.split(',')
+        dimensions = {d.strip() for d in dimensions}
+        has_rgb = {'Red', 'Green', 'Blue'} <= dimensions
         
         if not has_rgb:
-            print("WARNING: LAS file does not appear to have RGB color data (Red, Green, Blue dimensions)")
-            print("         Falling back to intensity mode")
+            logger.warning("LAS file does not appear to have RGB color data (Red, Green, Blue dimensions), "
+                           "falling back to intensity mode")
             mode = 'intensity'
     
     bounds = info['bounds']
@@ -648,20 +1559,29 @@ def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensi
     max_dim = max(width, height, depth)
     camera_distance = max_dim * 2.5  # Position camera far enough to see the whole cloud
     
-    print(f"Point cloud center: ({center_x:.2f}, {center_y:.2f}, {center_z:.2f})")
-    print(f"Point cloud size: {width:.2f}m x {height:.2f}m x {depth:.2f}m")
-    print(f"Resolution: {resolution} meters")
-    print(f"Mode: {mode}")
-    print(f"Generating {count} perspective views from different angles...")
-    print()
+    logger.info(f"Point cloud center: ({center_x:.2f}, {center_y:.2f}, {center_z:.2f})")
+    logger.info(f"Point cloud size: {width:.2f}m x {height:.2f}m x {depth:.2f}m")
+    logger.info(f"Resolution: {resolution} meters")
+    logger.info(f"Mode: {mode}")
+    logger.info(f"Generating {count} perspective views from different angles...")
     
     # Verify resolution is reasonable
     if resolution <= 0:
-        print(f"ERROR: Invalid resolution: {resolution}")
+        logger.error(f"Invalid resolution: {resolution}")
         return False
     if resolution > max(width, height) / 10:
-        print(f"WARNING: Resolution ({resolution}m) seems very large compared to point cloud size")
-        print(f"         Consider using a smaller resolution (e.g., {max(width, height) / 100:.2f}m)")
+        logger.warning(f"Resolution ({resolution}m) seems very large compared to point cloud size, "
+                       f"consider using a smaller resolution (e.g., {max(width, height) / 100:.2f}m)")
+    
+    # Each view covers 60% of total bounds, and neighbouring views are shifted
+    # by (1 - crop_fraction) / grid_size of the extent. Once that shift is under
+    # a pixel, additional views are just near-duplicates of each other
+    crop_fraction = 0.6
+    max_grid_size = max(1, int(max(width, height) * (1 - crop_fraction) / resolution))
+    if count > max_grid_size ** 2:
+        logger.info(f"Note: Point cloud is too small for {count} distinct views at {resolution}m resolution, "
+                    f"generating {max_grid_size ** 2} views instead")
+        count = max_grid_size ** 2
     
     base_name = las_file.stem
     created_count = 0
@@ -677,6 +1597,7 @@ def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensi
     cell_width = width / grid_size
     cell_height = height / grid_size
     
+    views = []
     for i in range(count):
         # Generate azimuth (0-360 degrees) and elevation (10-85 degrees)
         # Distribute evenly around the sphere
@@ -696,7 +1617,6 @@ def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensi
         
         # Calculate crop bounds for this view (different region of point cloud)
         # Use a fraction of the total bounds to create overlapping but distinct views
-        crop_fraction = 0.6  # Each view covers 60% of total bounds
         crop_offset_x = (grid_col / grid_size) * width * (1 - crop_fraction)
         crop_offset_y = (grid_row / grid_size) * height * (1 - crop_fraction)
         
@@ -710,354 +1630,67 @@ def create_perspective_views(las_file, output_dir, resolution=0.1, mode='intensi
         
         # Create output filename with view number and angles
         output_file = output_dir / f"{base_name}_view_{i+1:03d}_az{int(azimuth)}_el{int(elevation)}.tif"
-        
-        try:
-            # Create a rotated view by transforming coordinates
-            # We'll create a bounding box that's rotated to this view angle
-            # For simplicity, we'll use the full bounds but the view will be from a different angle
-            
-            # Create PDAL pipeline that creates an orthographic view
-            # Since PDAL doesn't support true perspective, we'll create views
-            # from different positions by cropping/rotating the data
-            
-            if mode == 'rgb':
-                # RGB mode - create 3 separate bands and combine
-                red_tif = output_dir / f"{base_name}_view_{i+1:03d}_az{int(azimuth)}_el{int(elevation)}_red.tif"
-                green_tif = output_dir / f"{base_name}_view_{i+1:03d}_az{int(azimuth)}_el{int(elevation)}_green.tif"
-                blue_tif = output_dir / f"{base_name}_view_{i+1:03d}_az{int(azimuth)}_el{int(elevation)}_blue.tif"
-                
-                # Check if RGB dimensions exist in the point cloud first
-                rgb_success = True
-                # Create separate pipelines for each band
-                for dim, temp_file in [("Red", red_tif), ("Green", green_tif), ("Blue", blue_tif)]:
-                    # Add crop filter to create spatial diversity
-                    pipeline_stages = [
-                        {
-                            "type": "readers.las",
-                            "filename": str(las_file)
-                        }
-                    ]
-                    
-                    # Add crop filter to focus on different region
-                    if view_min_x < view_max_x and view_min_y < view_max_y:
-                        pipeline_stages.append({
-                            "type": "filters.crop",
-                            "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
-                        })
-                    
-                    pipeline_stages.append({
-                        "type": "writers.gdal",
-                        "filename": str(temp_file),
-                        "resolution": view_resolution,
-                        "radius": view_resolution,
-                        "output_type": "mean",
-                        "dimension": dim,
-                        "data_type": "uint16_t",
-                        "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                    })
-                    
-                    pipeline_json = {"pipeline": pipeline_stages}
-                    
-                    pf_temp = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-                    json.dump(pipeline_json, pf_temp)
-                    pf_temp.close()
-                    
-                    try:
-                        result = subprocess.run(["pdal", "pipeline", pf_temp.name],
-                                              capture_output=True, check=True, text=True)
-                        # Check if file was created and has non-zero size
-                        if not os.path.exists(temp_file) or os.path.getsize(temp_file) == 0:
-                            print(f"  Warning: {dim} band file is empty or missing, falling back to intensity")
-                            rgb_success = False
-                            break
-                    except subprocess.CalledProcessError as e:
-                        print(f"  Warning: Failed to create {dim} band: {e.stderr if e.stderr else 'Unknown error'}")
-                        rgb_success = False
-                        break
-                    finally:
-                        if os.path.exists(pf_temp.name):
-                            os.unlink(pf_temp.name)
-                
-                if not rgb_success:
-                    # Fallback to intensity mode
-                    print(f"  Falling back to intensity mode for view {i+1}")
-                    pipeline_stages = [
-                        {
-                            "type": "readers.las",
-                            "filename": str(las_file)
-                        }
-                    ]
-                    
-                    # Add crop filter for spatial diversity
-                    if view_min_x < view_max_x and view_min_y < view_max_y:
-                        pipeline_stages.append({
-                            "type": "filters.crop",
-                            "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
-                        })
-                    
-                    pipeline_stages.append({
-                        "type": "writers.gdal",
-                        "filename": str(output_file),
-                        "resolution": view_resolution,
-                        "radius": view_resolution,
-                        "output_type": "mean",
-                        "dimension": "Intensity",
-                        "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                    })
-                    
-                    pipeline_json = {"pipeline": pipeline_stages}
-                    
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                        json.dump(pipeline_json, f)
-                        pipeline_file = f.name
-                    
-                    try:
-                        subprocess.run(["pdal", "pipeline", pipeline_file],
-                                      capture_output=True, check=True, text=True)
-                        created_count += 1
-                    finally:
-                        if os.path.exists(pipeline_file):
-                            os.unlink(pipeline_file)
-                    # Clean up any partial RGB files
-                    for f in [red_tif, green_tif, blue_tif]:
-                        if os.path.exists(f):
-                            os.unlink(f)
-                    continue
-                
-                # Combine RGB bands using GDAL
-                gdalbuildvrt = shutil.which('gdalbuildvrt')
-                gdal_translate = shutil.which('gdal_translate')
-                if gdalbuildvrt and gdal_translate:
-                    vrt_path = str(output_file).replace('.tif', '.vrt')
-                    try:
-                        # Build VRT
-                        result = subprocess.run([gdalbuildvrt, "-separate", vrt_path, str(red_tif), str(green_tif), str(blue_tif)],
-                                             capture_output=True, check=True, text=True)
-                        
-                        # Translate to final RGB with proper scaling
-                        # First check the actual value range in the files
-                        result = subprocess.run([
-                            gdal_translate, vrt_path, str(output_file),
-                            "-ot", "Byte",
-                            "-scale", "0", "65535", "0", "255",  # Scale 16-bit to 8-bit
-                            "-co", "COMPRESS=DEFLATE",
-                            "-co", "PREDICTOR=2",
-                            "-co", "PHOTOMETRIC=RGB",
-                            "-co", "BIGTIFF=YES"
-                        ], capture_output=True, check=True, text=True)
-                        
-                        # Verify the output file is not empty/black
-                        if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                            created_count += 1
-                        else:
-                            print(f"  Warning: Output RGB file is empty, falling back to intensity")
-                            # Fallback to intensity
-                            pipeline_json = {
-                                "pipeline": [
-                                    {
-                                        "type": "readers.las",
-                                        "filename": str(las_file)
-                                    },
-                                    {
-                                        "type": "writers.gdal",
-                                        "filename": str(output_file),
-                                        "resolution": resolution,
-                                        "radius": resolution,
-                                        "output_type": "mean",
-                                        "dimension": "Intensity",
-                                        "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                                    }
-                                ]
-                            }
-                            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                                json.dump(pipeline_json, f)
-                                pipeline_file = f.name
-                            try:
-                                subprocess.run(["pdal", "pipeline", pipeline_file],
-                                              capture_output=True, check=True, text=True)
-                                created_count += 1
-                            finally:
-                                if os.path.exists(pipeline_file):
-                                    os.unlink(pipeline_file)
-                    except subprocess.CalledProcessError as e:
-                        print(f"  Warning: GDAL RGB combination failed: {e.stderr if e.stderr else 'Unknown error'}")
-                        # Fallback to intensity
-                        pipeline_json = {
-                            "pipeline": [
-                                {
-                                    "type": "readers.las",
-                                    "filename": str(las_file)
-                                },
-                                {
-                                    "type": "writers.gdal",
-                                    "filename": str(output_file),
-                                    "resolution": resolution,
-                                    "radius": resolution,
-                                    "output_type": "mean",
-                                    "dimension": "Intensity",
-                                    "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                                }
-                            ]
-                        }
-                        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                            json.dump(pipeline_json, f)
-                            pipeline_file = f.name
-                        try:
-                            subprocess.run(["pdal", "pipeline", pipeline_file],
-                                          capture_output=True, check=True, text=True)
-                            created_count += 1
-                        finally:
-                            if os.path.exists(pipeline_file):
-                                os.unlink(pipeline_file)
-                    
-                    # Clean up temp files
-                    for f in [red_tif, green_tif, blue_tif, vrt_path]:
-                        if os.path.exists(f):
-                            try:
-                                os.unlink(f)
-                            except:
-                                pass
-                    continue
-                else:
-                    # GDAL tools not available - fallback to intensity
-                    print(f"  Warning: GDAL tools not available, falling back to intensity")
-                    for f in [red_tif, green_tif, blue_tif]:
-                        if os.path.exists(f):
-                            os.unlink(f)
-                    pipeline_json = {
-                        "pipeline": [
-                            {
-                                "type": "readers.las",
-                                "filename": str(las_file)
-                            },
-                            {
-                                "type": "writers.gdal",
-                                "filename": str(output_file),
-                                "resolution": resolution,
-                                "radius": resolution,
-                                "output_type": "mean",
-                                "dimension": "Intensity",
-                                "gdalopts": "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                            }
-                        ]
-                    }
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                        json.dump(pipeline_json, f)
-                        pipeline_file = f.name
+        views.append((las_file, output_file, (view_min_x, view_min_y, view_max_x, view_max_y),
+                      resolution, view_resolution, mode, i))
+    
+    # Views overlap a lot, so rather than binning the same points for every view,
+    # rasterize the point cloud once and cut each view out of that raster.
+    # Its cells without points are nodata (see writer_nodata), so averaging leaves them out.
+    # Counts depend on the cell size and can't be resampled, they are binned per view
+    if mode != 'count' and len(views) > 1 and (gdal is not None or rasterio is not None):
+        logger.info(f"Rasterizing the point cloud once for {len(views)} views...")
+        with tempfile.TemporaryDirectory(dir=output_dir) as tmpdir:
+            full_raster = Path(tmpdir) / f"{base_name}_{mode}.tif"
+            success, _ = rasterize_pointcloud(las_file, full_raster, resolution, mode)
+            empty = set()
+            if success:
+                for view in views:
                     try:
-                        subprocess.run(["pdal", "pipeline", pipeline_file],
-                                      capture_output=True, check=True, text=True)
-                        created_count += 1
-                    finally:
-                        if os.path.exists(pipeline_file):
-                            os.unlink(pipeline_file)
-                    continue
-            else:
-                # Non-RGB modes: intensity, elevation, count
-                dimension_name = (
-                    "Z" if mode == 'elevation'
-                    else "Intensity" if mode == 'intensity'
-                    else "Intensity"  # Default fallback
-                )
-                
-                # Set appropriate data type and gdalopts based on dimension
-                if mode == 'elevation':
-                    data_type = "float32"
-                    gdalopts = "COMPRESS=DEFLATE,BIGTIFF=YES"  # No PREDICTOR for float32
-                elif mode == 'intensity':
-                    data_type = "uint16_t"
-                    gdalopts = "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                elif mode == 'count':
-                    data_type = "uint32_t"
-                    gdalopts = "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                else:
-                    data_type = "uint16_t"
-                    gdalopts = "COMPRESS=DEFLATE,PREDICTOR=2,BIGTIFF=YES"
-                
-                # Build pipeline with crop filter for spatial diversity
-                pipeline_stages = [
-                    {
-                        "type": "readers.las",
-                        "filename": str(las_file)
-                    }
-                ]
-                
-                # Add crop filter to focus on different region
-                if view_min_x < view_max_x and view_min_y < view_max_y:
-                    pipeline_stages.append({
-                        "type": "filters.crop",
-                        "bounds": f"([{view_min_x:.6f}, {view_max_x:.6f}], [{view_min_y:.6f}, {view_max_y:.6f}])"
-                    })
-                
-                pipeline_stages.append({
-                    "type": "writers.gdal",
-                    "filename": str(output_file),
-                    "resolution": view_resolution,
-                    "radius": view_resolution,
-                    "output_type": "mean" if mode != 'count' else "count",
-                    "dimension": dimension_name,
-                    "data_type": data_type,
-                    "gdalopts": gdalopts
-                })
-                
-                pipeline_json = {"pipeline": pipeline_stages}
-                
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                    json.dump(pipeline_json, f)
-                    pipeline_file = f.name
-                
-                try:
-                    result = subprocess.run(["pdal", "pipeline", pipeline_file],
-                                          capture_output=True, check=True, text=True)
-                    
-                    # Verify the output file was created and is not empty
-                    if os.path.exists(output_file):
-                        file_size = os.path.getsize(output_file)
-                        if file_size > 0:
-                            # Check if file has actual data (not just black)
-                            try:
-                                import rasterio
-                                with rasterio.open(output_file) as src:
-                                    data = src.read(1)
-                                    min_val = float(data.min())
-                                    max_val = float(data.max())
-                                    mean_val = float(data.mean())
-                                    if max_val == 0 and min_val == 0:
-                                        print(f"  ⚠ Warning: View {i+1} is all zeros (black) - check if {dimension_name} dimension exists in LAS file")
-                                    else:
-                                        print(f"  ✓ Created view {i+1}: {output_file.name} ({file_size} bytes, values: {min_val:.1f}-{max_val:.1f}, mean: {mean_val:.1f})")
-                                        created_count += 1
-                            except ImportError:
-                                # rasterio not available, just check file size
-                                created_count += 1
-                                print(f"  ✓ Created view {i+1}: {output_file.name} ({file_size} bytes)")
-                            except Exception as e:
-                                print(f"  ⚠ Warning: Could not verify view {i+1} data: {e}")
-                                created_count += 1
-                        else:
-                            print(f"  ✗ Warning: View {i+1} file is empty (0 bytes)")
-                    else:
-                        print(f"  ✗ Warning: View {i+1} file was not created")
-                        
-                except subprocess.CalledProcessError as e:
-                    print(f"  ✗ Error creating view {i+1}: {e.stderr if e.stderr else str(e)}")
-                    if e.stdout:
-                        print(f"    stdout: {e.stdout[:200]}")
-                finally:
-                    if os.path.exists(pipeline_file):
-                        os.unlink(pipeline_file)
-                        
-        except Exception as e:
-            print(f"  Warning: Failed to create view {i+1}: {e}")
-            continue
+                        if not crop_raster(full_raster, view[1], view[2], view[4]):
+                            empty.add(view[-1])
+                    except RuntimeError as e:
+                        logger.warning(f"  Failed to crop view {view[-1]+1}: {e}")
+        
+        # Views without any points are dropped rather than rasterized again below
+        if empty:
+            logger.info(f"  Skipping {len(empty)} views with no points")
+        missing = [v for v in views if v[-1] not in empty and not file_size(v[1])]
+        created_count += len(views) - len(empty) - len(missing)
+        views = missing
     
-    print(f"\n✓ Successfully created {created_count} perspective view images!")
-    print(f"  You can now upload all images from {output_dir} to WebODM")
+    # Read the point cloud once and crop/write every view
+    # from the same pipeline instead of re-reading it per view
+    if len(views) > 1:
+        logger.info(f"Creating {len(views)} views in a single pipeline...")
+        _, empty = create_views_pipeline(las_file, views, mode)
+        if empty:
+            logger.info(f"  Skipping {len(empty)} views with no points")
+        
+        # Whatever the single pipeline didn't produce is created per view below
+        missing = [v for v in views if v[-1] not in empty and not file_size(v[1])]
+        created_count += len(views) - len(empty) - len(missing)
+        if missing:
+            logger.warning(f"  {len(missing)} views were not created, retrying them individually")
+        views = missing
+    
+    # Views are independent; each worker runs its pipeline in this process through
+    # the PDAL bindings (a pdal subprocess without them), one per CPU this process may use
+    if views:
+        max_workers = min(len(views), available_cpus())
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=limit_gdal_threads,
+                                initargs=(max_workers,)) as executor:
+            futures = [executor.submit(create_view, *view) for view in views]
+            for future in as_completed(futures):
+                if future.result():
+                    created_count += 1
+    
+    logger.info(f"✓ Successfully created {created_count} perspective view images!")
+    logger.info(f"  You can now upload all images from {output_dir} to WebODM")
     return created_count > 0
 
 
 def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='intensity', multiview=False, 
-                         tile_size=100, overlap=0.3, count=30, use_perspective=False):
+                         tile_size=100, overlap=0.3, count=30, use_perspective=False, preview=False):
     """
     Convert LAS file to one or more image files.
     
@@ -1065,30 +1698,32 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='intensity'
         las_file: Path to input LAS/LAZ file
         output_dir: Directory to save output images
         resolution: Pixel resolution in meters
-        mode: Rasterization mode ('intensity', 'rgb', 'elevation', 'count')
+        mode: Rasterization mode ('intensity', 'rgb', 'elevation', 'count'),
+              or a list of modes to create an image for each
         multiview: If True, create multiple overlapping tiles instead of single image
         tile_size: Size of each tile in meters (for multiview mode)
         overlap: Overlap percentage between tiles (0.0-1.0, for multiview mode)
+        preview: If True, create faster, approximate single images at coarse resolutions
     """
+    modes = [mode] if isinstance(mode, str) else list(mode)
     las_file = Path(las_file)
     output_dir = Path(output_dir)
     
     if not las_file.exists():
-        print(f"ERROR: Input file does not exist: {las_file}")
+        logger.error(f"Input file does not exist: {las_file}")
         return False
     
     if not las_file.suffix.lower() in ['.las', '.laz']:
-        print(f"ERROR: Input file must be .las or .laz: {las_file}")
+        logger.error(f"Input file must be .las or .laz: {las_file}")
         return False
     
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    print(f"Converting {las_file} to images...")
-    print(f"Output directory: {output_dir}")
-    print(f"Resolution: {resolution} meters")
-    print(f"Mode: {mode}")
-    print()
+    logger.info(f"Converting {las_file} to images...")
+    logger.info(f"Output directory: {output_dir}")
+    logger.info(f"Resolution: {resolution} meters")
+    logger.info(f"Mode: {', '.join(modes)}")
     
     # Get LAS file info to auto-calculate resolution if needed
     info = get_las_info(las_file)
@@ -1100,32 +1735,43 @@ def convert_las_to_images(las_file, output_dir, resolution=0.1, mode='intensity'
                 info.get('count', 0)
             )
             resolution = calculated_res
-            print(f"Auto-calculated resolution: {resolution} meters")
+            logger.info(f"Auto-calculated resolution: {resolution} meters")
     
     # Use perspective views if requested (generates views from different angles)
     if use_perspective:
-        return create_perspective_views(las_file, output_dir, resolution, mode, count)
+        return all([create_perspective_views(las_file, output_dir, resolution, m, count) for m in modes])
     
     # Use multiview mode if requested (creates overlapping tiles)
     if multiview:
-        return create_multiview_images(las_file, output_dir, resolution, mode, tile_size, overlap, count)
+        return all([create_multiview_images(las_file, output_dir, resolution, m, tile_size, overlap, count) for m in modes])
     
-    # Generate output filename
+    # Generate output filenames
     base_name = las_file.stem
-    output_file = output_dir / f"{base_name}_{mode}_{resolution}m.tif"
+    output_files = {m: output_dir / f"{base_name}_{m}_{resolution}m.tif" for m in modes}
     
-    # Rasterize the point cloud
-    success, error = rasterize_pointcloud(las_file, output_file, resolution, mode)
+    # Rasterize the point cloud, writing all the single band
+    # images from one pipeline when more than one is requested
+    shared = [m for m in modes if m != 'rgb']
+    if len(shared) < 2:
+        shared = []
+    
+    success, error = True, None
+    if shared:
+        success, error = rasterize_pointcloud_modes(las_file, {m: output_files[m] for m in shared}, resolution, preview)
+    for m in modes:
+        if success and m not in shared:
+            success, error = rasterize_pointcloud(las_file, output_files[m], resolution, m, preview)
     
     if success:
-        print(f"\n✓ Conversion complete!")
-        print(f"  Output file: {output_file}")
-        print(f"\nYou can now upload {output_file} to WebODM for processing.")
+        logger.info("✓ Conversion complete!")
+        for output_file in output_files.values():
+            logger.info(f"  Output file: {output_file}")
+        logger.info(f"You can now upload {'these files' if len(output_files) > 1 else output_file} to WebODM for processing.")
         return True
     else:
-        print("\n✗ Conversion failed!")
+        logger.error("✗ Conversion failed!")
         if error:
-            print(f"  Error: {error}")
+            logger.error(f"  {error}")
         return False
 
 
@@ -1147,6 +1793,9 @@ Examples:
   # Convert using elevation values
   python las_to_images.py input.las output/ --mode elevation
   
+  # Create intensity, elevation and density images, reading the point cloud once
+  python las_to_images.py input.las output/ --mode intensity elevation count
+  
   # Create multiple overlapping tiles (better for photogrammetry)
   python las_to_images.py input.las output/ --multiview --tile-size 100 --overlap 0.3
   
@@ -1160,23 +1809,25 @@ Examples:
     parser.add_argument('--resolution', type=float, default=0.1,
                        help='Pixel resolution in meters (default: 0.1)')
     parser.add_argument('--mode', choices=['intensity', 'rgb', 'elevation', 'count'],
-                       default='intensity',
-                       help='Rasterization mode (default: intensity)')
+                       nargs='+', default=['intensity'],
+                       help='Rasterization mode(s); several single band modes are rasterized in one pass (default: intensity)')
     parser.add_argument('--multiview', action='store_true',
                        help='Create multiple overlapping tiles instead of single image (better for photogrammetry)')
     parser.add_argument('--tile-size', type=float, default=100,
                        help='Tile size in meters for multiview mode (default: 100)')
     parser.add_argument('--overlap', type=float, default=0.3,
                        help='Overlap percentage between tiles 0.0-1.0 (default: 0.3 = 30%%)')
+    parser.add_argument('--preview', action='store_true',
+                       help='Sample the points before rasterizing for a faster, approximate image (resolutions above 0.2m)')
     
     args = parser.parse_args()
     
     # Check prerequisites
     if not check_pdal():
-        print("ERROR: PDAL is not installed or not in PATH.")
-        print("Please install PDAL: https://pdal.io/download.html")
-        print("On Ubuntu/Debian: sudo apt-get install pdal")
-        print("On macOS: brew install pdal")
+        logger.error("PDAL is not installed or not in PATH.\n"
+                     "Please install PDAL: https://pdal.io/download.html\n"
+                     "On Ubuntu/Debian: sudo apt-get install pdal\n"
+                     "On macOS: brew install pdal")
         sys.exit(1)
     
     # Convert the file
@@ -1187,12 +1838,14 @@ Examples:
         args.mode,
         args.multiview,
         args.tile_size,
-        args.overlap
+        args.overlap,
+        preview=args.preview
     )
     
     sys.exit(0 if success else 1)
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
 
@@ -0,0 +1,182 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from django.test import TestCase
+
+from app.scripts.las_to_images import grid_dimension, crop_raster, writer_nodata, raster_has_data, \
+    remove_empty_rasters, should_build_copc, limit_gdal_threads, gdal_num_threads, COPC_MAX_POINTS, COPC_MIN_TILES
+
+
+class TestLasToImages(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_raster(self, name, data, nodata=None):
+        # 1m pixels, top left corner at (0, height)
+        path = os.path.join(self.tmp_dir.name, name)
+        count, height, width = data.shape
+        with rasterio.open(path, 'w', driver='GTiff', width=width, height=height, count=count,
+                           dtype=data.dtype, nodata=nodata, transform=from_origin(0, height, 1, 1)) as dst:
+            dst.write(data)
+        return path
+
+    def test_grid_dimension(self):
+        # Tiles start every step until one reaches the far edge
+        self.assertEqual(grid_dimension(100, 40, 12), 6)
+        self.assertEqual(grid_dimension(100, 50, 35), 3)
+
+        # No overlap
+        self.assertEqual(grid_dimension(100, 40, 40), 3)
+        self.assertEqual(grid_dimension(120, 40, 40), 3)
+
+        # A tile larger than the extent covers it alone
+        self.assertEqual(grid_dimension(30, 40, 28), 1)
+        self.assertEqual(grid_dimension(40, 40, 10), 1)
+
+        # Float rounding doesn't add a sliver column/row
+        # ((0.3 - 0.1) / 0.1 == 2.0000000000000004)
+        self.assertEqual(grid_dimension(0.3, 0.1, 0.1), 3)
+        self.assertEqual(grid_dimension(1.2, 0.4, 0.4), 3)
+        self.assertEqual(grid_dimension(0.7, 0.1, 0.1), 7)
+
+        # Steps below a millimeter can't tile anything
+        self.assertEqual(grid_dimension(100, 50, 0), 1)
+        self.assertEqual(grid_dimension(100, 50, 0.0001), 1)
+
+    def test_grid_stops_at_far_edge(self):
+        for extent, tile_size, step in [(100, 40, 12), (100, 50, 35), (57.3, 10, 7.5), (12.5, 5, 2.5)]:
+            n = grid_dimension(extent, tile_size, step)
+            last_start = (n - 1) * step
+
+            # The last tile reaches the far edge...
+            self.assertTrue(last_start + tile_size >= extent - 1e-6)
+
+            # ...and the one before doesn't, so no tile is a clamped copy of its neighbour
+            self.assertTrue((n - 2) * step + tile_size < extent)
+
+    def test_should_build_copc(self):
+        self.assertTrue(should_build_copc(1000, COPC_MIN_TILES))
+        self.assertTrue(should_build_copc(COPC_MAX_POINTS, COPC_MIN_TILES + 10))
+
+        # Too few tiles to pay for the index
+        self.assertFalse(should_build_copc(1000, COPC_MIN_TILES - 1))
+
+        # Too many points to hold in memory, or unknown size
+        self.assertFalse(should_build_copc(COPC_MAX_POINTS + 1, COPC_MIN_TILES))
+        self.assertFalse(should_build_copc(0, COPC_MIN_TILES))
+        self.assertFalse(should_build_copc(None, COPC_MIN_TILES))
+
+    def test_raster_has_data(self):
+        # Every writers.gdal data type gets a nodata value it can hold
+        self.assertEqual(writer_nodata("float32"), -9999)
+        for data_type in ("uint8_t", "uint16_t", "uint32_t"):
+            self.assertEqual(writer_nodata(data_type), 0)
+
+        paths = []
+        for dtype, nodata in (('float32', -9999), ('uint8', 0), ('uint16', 0), ('uint32', 0)):
+            data = np.full((1, 4, 4), nodata, dtype=dtype)
+            empty = self.write_raster(f"empty_{dtype}.tif", data, nodata=writer_nodata(dtype))
+            data[0, 1, 2] = 7
+            full = self.write_raster(f"full_{dtype}.tif", data, nodata=writer_nodata(dtype))
+
+            self.assertFalse(raster_has_data(empty))
+            self.assertTrue(raster_has_data(full))
+            paths += [empty, full]
+
+        # Without nodata every pixel is valid
+        self.assertTrue(raster_has_data(self.write_raster("no_nodata.tif", np.zeros((1, 4, 4), dtype=np.uint16))))
+
+        # Only the empty rasters are removed
+        removed = remove_empty_rasters(paths)
+        self.assertEqual(removed, set(paths[::2]))
+        self.assertEqual([os.path.exists(p) for p in paths], [False, True] * 4)
+
+    def test_crop_raster(self):
+        # 8x8, each pixel holds its column index; the right half has no data
+        data = np.tile(np.arange(8, dtype=np.float32), (1, 8, 1))
+        data[:, :, 4:] = -9999
+        source = self.write_raster("source.tif", data, nodata=-9999)
+
+        # Left half at 2m: columns are averaged in pairs
+        output = os.path.join(self.tmp_dir.name, "left.tif")
+        self.assertTrue(crop_raster(source, output, (0, 0, 4, 8), 2))
+        with rasterio.open(output) as src:
+            self.assertEqual((src.count, src.width, src.height), (1, 2, 4))
+            self.assertEqual(tuple(src.bounds), (0, 0, 4, 8))
+            cropped = src.read(1)
+        self.assertTrue(np.allclose(cropped, [[0.5, 2.5]] * 4))
+
+        # Regions without data are skipped and nothing is written
+        output = os.path.join(self.tmp_dir.name, "right.tif")
+        self.assertFalse(crop_raster(source, output, (4, 0, 8, 8), 2))
+        self.assertFalse(os.path.exists(output))
+
+        # Bands are kept
+        rgb = np.stack([np.full((8, 8), v, dtype=np.uint8) for v in (10, 20, 30)])
+        source = self.write_raster("rgb.tif", rgb)
+        output = os.path.join(self.tmp_dir.name, "rgb_crop.tif")
+        self.assertTrue(crop_raster(source, output, (2, 2, 6, 6), 1))
+        with rasterio.open(output) as src:
+            self.assertEqual((src.count, src.width, src.height), (3, 4, 4))
+            self.assertEqual([int(b.mean()) for b in src.read()], [10, 20, 30])
+
+    def test_crop_raster_skips_empty_integer_regions(self):
+        # Intensity (uint16) and RGB (uint8) rasters mark cells without points with 0
+        intensity = np.zeros((1, 8, 8), dtype=np.uint16)
+        intensity[:, :, :4] = 1000
+        rgb = np.zeros((3, 8, 8), dtype=np.uint8)
+        rgb[:, :, :4] = 200
+
+        for name, data in (("intensity.tif", intensity), ("rgb.tif", rgb)):
+            source = self.write_raster(name, data, nodata=writer_nodata(str(data.dtype)))
+
+            output = os.path.join(self.tmp_dir.name, f"left_{name}")
+            self.assertTrue(crop_raster(source, output, (0, 0, 4, 8), 2))
+            self.assertTrue(os.path.exists(output))
+
+            output = os.path.join(self.tmp_dir.name, f"right_{name}")
+            self.assertFalse(crop_raster(source, output, (4, 0, 8, 8), 2))
+            self.assertFalse(os.path.exists(output))
+
+    def test_crop_raster_averages_valid_cells(self):
+        # A uint16 intensity raster as written by rasterize_pointcloud:
+        # every other column has no points
+        data = np.zeros((1, 8, 8), dtype=np.uint16)
+        data[:, :, ::2] = 1000
+        source = self.write_raster("intensity.tif", data, nodata=writer_nodata("uint16_t"))
+
+        # At 2m each output cell covers one cell with points and one without;
+        # the empty ones don't pull the average down
+        output = os.path.join(self.tmp_dir.name, "crop.tif")
+        self.assertTrue(crop_raster(source, output, (0, 0, 8, 8), 2))
+        with rasterio.open(output) as src:
+            self.assertEqual(src.dtypes[0], 'uint16')
+            self.assertEqual(src.nodata, 0)
+            self.assertEqual((src.width, src.height), (4, 4))
+            self.assertTrue((src.read(1) == 1000).all())
+
+    def test_limit_gdal_threads(self):
+        # Conversions outside of pools use every CPU
+        self.assertEqual(gdal_num_threads(), "ALL_CPUS")
+
+        # Pool workers share them
+        def worker_threads(workers):
+            with ThreadPoolExecutor(max_workers=workers, initializer=limit_gdal_threads,
+                                    initargs=(workers,)) as executor:
+                return set(executor.map(lambda _: gdal_num_threads(), range(workers * 4)))
+
+        with mock.patch('app.scripts.las_to_images.available_cpus', return_value=8):
+            self.assertEqual(worker_threads(1), {"8"})
+            self.assertEqual(worker_threads(4), {"2"})
+            self.assertEqual(worker_threads(16), {"1"})
+
+        # The calling thread is left alone
+        self.assertEqual(gdal_num_threads(), "ALL_CPUS")
@@ -0,0 +1,226 @@
+import os
+import time
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from django.test import TestCase, override_settings
+
+from app.api import lasconversion
+from app.api.lasconversion import write_chunks, find_files, locate_converted_file, is_las_file, \
+    get_percentile_range, get_band_range, cleanup_las_tmp_dirs, PERCENTILE_DECIMATION, FAST_TMP_MAX_AGE, LAS_TMP_MAX_AGE
+
+
+class TestLasConversion(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def touch(self, *parts, data=b""):
+        path = os.path.join(self.tmp_dir.name, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def read_written(self, chunks, **kwargs):
+        path = os.path.join(self.tmp_dir.name, "out.bin")
+        with open(path, 'wb') as f:
+            f.write(b"head")
+            write_chunks(f, chunks, **kwargs)
+            f.write(b"tail")
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_write_chunks(self):
+        chunks = [bytes([i]) * (i + 1) for i in range(40)]
+        expected = b"head" + b"".join(chunks) + b"tail"
+
+        # Batched writes keep the order, also around buffered writes
+        self.assertEqual(self.read_written(chunks), expected)
+        self.assertEqual(self.read_written(chunks, batch_size=1), expected)
+        self.assertEqual(self.read_written(chunks, batch_size=100), expected)
+        self.assertEqual(self.read_written([]), b"headtail")
+
+        # Chunks can come from a generator
+        self.assertEqual(self.read_written(c for c in chunks), expected)
+
+        # Partial writev() calls get their tail written
+        writev = os.writev
+        def partial_writev(fd, buffers):
+            data = b"".join(buffers)
+            return writev(fd, [data[:len(data) // 3]])
+
+        with mock.patch('os.writev', side_effect=partial_writev) as m:
+            self.assertEqual(self.read_written(chunks, batch_size=7), expected)
+            self.assertEqual(m.call_count, 6)
+
+        # Partial os.write() calls while finishing the tail too
+        write = os.write
+        def short_write(fd, data):
+            return write(fd, bytes(data[:5]))
+
+        with mock.patch('os.writev', side_effect=partial_writev), \
+             mock.patch('os.write', side_effect=short_write):
+            self.assertEqual(self.read_written(chunks, batch_size=7), expected)
+
+        # Without writev(), chunks go through the file object
+        del os.writev
+        try:
+            self.assertEqual(self.read_written(chunks), expected)
+        finally:
+            os.writev = writev
+
+    def test_find_files(self):
+        d = self.tmp_dir.name
+        for name in ("a.jpg", "b.jpg", "c.tif", "d.TIF", "notes.txt"):
+            self.touch(name)
+        self.touch("sub", "e.jpg")
+        os.mkdir(os.path.join(d, "dir.tif"))
+
+        def names(files):
+            return sorted(f.name for f in files)
+
+        # Files matching the first pattern that matches anything
+        self.assertEqual(names(find_files(d, ["*.jpg", "*.tif"])), ["a.jpg", "b.jpg"])
+        self.assertEqual(names(find_files(d, ["*.png", "*.tif"])), ["c.tif"])
+        self.assertTrue(all(isinstance(f, Path) and f.parent == Path(d) for f in find_files(d, ["*.jpg"])))
+
+        # Files matching any pattern; matching is case sensitive
+        # and neither directories nor subdirectories are included
+        self.assertEqual(names(find_files(d, ["*.jpg", "*.tif"], first_match=False)), ["a.jpg", "b.jpg", "c.tif"])
+        self.assertEqual(names(find_files(d, ["*.TIF"])), ["d.TIF"])
+
+        self.assertEqual(find_files(d, ["*.png"]), [])
+        self.assertEqual(find_files(os.path.join(d, "missing"), ["*.jpg"]), [])
+
+    def test_locate_converted_file(self):
+        d = self.tmp_dir.name
+        self.assertTrue(locate_converted_file(os.path.join(d, "missing"), "a.jpg") is None)
+
+        top = self.touch("a.jpg")
+        self.assertEqual(locate_converted_file(d, "a.jpg"), top)
+
+        # jpg/ and tif/ come before the top level
+        tif = self.touch("tif", "a.jpg")
+        self.assertEqual(locate_converted_file(d, "a.jpg"), tif)
+        jpg = self.touch("jpg", "a.jpg")
+        self.assertEqual(locate_converted_file(d, "a.jpg"), jpg)
+
+        # Only the top level holds the zip
+        zip_file = self.touch("converted_images.zip")
+        self.touch("jpg", "converted_images.zip")
+        self.assertEqual(locate_converted_file(d, "converted_images.zip"), zip_file)
+
+        # Directories aren't files
+        os.mkdir(os.path.join(d, "b.tif"))
+        self.assertTrue(locate_converted_file(d, "b.tif") is None)
+        self.assertTrue(locate_converted_file(d, "c.tif") is None)
+
+    def test_is_las_file(self):
+        self.assertTrue(is_las_file(self.touch("cloud.las", data=b"LASF" + bytes(223))))
+        self.assertTrue(is_las_file(self.touch("cloud.laz", data=b"LASF")))
+
+        self.assertFalse(is_las_file(self.touch("cloud.txt", data=b"1.0 2.0 3.0")))
+        self.assertFalse(is_las_file(self.touch("short.las", data=b"LAS")))
+        self.assertFalse(is_las_file(self.touch("empty.las")))
+        self.assertFalse(is_las_file(os.path.join(self.tmp_dir.name, "missing.las")))
+        self.assertFalse(is_las_file(self.tmp_dir.name))
+
+    def test_get_band_range(self):
+        # Exact ranges as reported by gdalinfo -json -mm
+        bands = [{'band': 1, 'computedMin': 3.0, 'computedMax': 4000.0},
+                 {'band': 2, 'computedMin': 0.0, 'computedMax': 65535.0}]
+        self.assertEqual(get_band_range(bands), (0, 65535))
+        self.assertEqual(get_band_range(bands[:1]), (3, 4000))
+
+        # No valid pixels
+        self.assertTrue(get_band_range([{'band': 1}]) is None)
+        self.assertTrue(get_band_range([]) is None)
+
+    def write_blocks(self, name, blocks, nodata=None):
+        """
+        Write a float raster made of PERCENTILE_DECIMATION-sized square blocks,
+        one per value of blocks (bands x rows x cols), so that the decimated
+        read of get_percentile_range sees exactly those values.
+        """
+        data = np.kron(np.asarray(blocks, dtype=np.float32),
+                       np.ones((1, PERCENTILE_DECIMATION, PERCENTILE_DECIMATION), dtype=np.float32))
+        path = os.path.join(self.tmp_dir.name, name)
+        count, height, width = data.shape
+        with rasterio.open(path, 'w', driver='GTiff', width=width, height=height, count=count,
+                           dtype='float32', nodata=nodata, transform=from_origin(0, height, 1, 1)) as dst:
+            dst.write(data)
+        return path
+
+    def assertRange(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertAlmostEqual(a, e, places=4)
+
+    def test_get_percentile_range(self):
+        values = np.arange(100).reshape(1, 10, 10)
+
+        # 2nd and 98th percentiles of 0..99
+        tif = self.write_blocks("ramp.tif", values)
+        self.assertRange(get_percentile_range(tif), (1.98, 97.02, 0, 99))
+
+        # Nodata, NaN and inf are left out
+        blocks = values.astype(np.float32)
+        blocks[0, 0, :3] = -9999
+        blocks[0, 9, 9] = np.nan
+        blocks[0, 9, 8] = np.inf
+        tif = self.write_blocks("nodata.tif", blocks, nodata=-9999)
+        p2, p98 = np.percentile(np.arange(3, 98), [2, 98])
+        self.assertRange(get_percentile_range(tif), (p2, p98, 3, 97))
+
+        # Outliers squeezing the percentiles into less than 10% of the range: use min/max
+        blocks = np.full((1, 10, 10), 50)
+        blocks[0, 0, :2] = 0
+        blocks[0, 9, 8:] = 1000
+        tif = self.write_blocks("outliers.tif", blocks)
+        self.assertRange(get_percentile_range(tif), (0, 1000, 0, 1000))
+
+        # Band selection
+        tif = self.write_blocks("bands.tif", np.concatenate([values, values + 1000]))
+        self.assertRange(get_percentile_range(tif, 2), (1001.98, 1097.02, 1000, 1099))
+        self.assertRange(get_percentile_range(tif, [1]), (1.98, 97.02, 0, 99))
+        self.assertRange(get_percentile_range(tif), np.percentile(np.concatenate([values, values + 1000]), [2, 98, 0, 100]))
+
+        # No valid data
+        tif = self.write_blocks("empty.tif", np.full((1, 10, 10), -9999), nodata=-9999)
+        self.assertTrue(get_percentile_range(tif) is None)
+
+    def test_cleanup_las_tmp_dirs(self):
+        fast_dir = os.path.join(self.tmp_dir.name, "shm")
+        las_dir = os.path.join(self.tmp_dir.name, "las")
+
+        def conversion(base_dir, age):
+            path = os.path.join(base_dir, "las_conv_{}".format(age))
+            os.makedirs(path)
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+            return path
+
+        # tmpfs conversions go after FAST_TMP_MAX_AGE, the others after LAS_TMP_MAX_AGE
+        fresh_fast = conversion(fast_dir, 60)
+        old_fast = conversion(fast_dir, FAST_TMP_MAX_AGE + 60)
+        fresh_las = conversion(las_dir, FAST_TMP_MAX_AGE + 60)
+        old_las = conversion(las_dir, LAS_TMP_MAX_AGE + 60)
+        other = os.path.join(las_dir, "other")
+        os.makedirs(other)
+        os.utime(other, (0, 0))
+
+        with override_settings(LAS_TMP_DIR=las_dir), mock.patch.object(lasconversion, 'FAST_TMP_DIR', fast_dir):
+            cleanup_las_tmp_dirs()
+
+        self.assertTrue(os.path.exists(fresh_fast))
+        self.assertFalse(os.path.exists(old_fast))
+        self.assertTrue(os.path.exists(fresh_las))
+        self.assertFalse(os.path.exists(old_las))
+        self.assertTrue(os.path.exists(other))
@@ -14,16 +14,25 @@ after the upload is completed as not to hog the number of open fd limits
 class TemporaryFileUploadHandler(FileUploadHandler):
     """
     Upload handler that streams data into a temporary file.
+
+    :param temp_dir: directory for the temporary files (default: FILE_UPLOAD_TEMP_DIR)
+    :param prefix: prefix of the temporary file names
+    :param chunk_size: size of the chunks read from the request body
     """
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, temp_dir=None, prefix='tmp', chunk_size=None, **kwargs):
         super(TemporaryFileUploadHandler, self).__init__(*args, **kwargs)
+        self.temp_dir = temp_dir
+        self.prefix = prefix
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
 
     def new_file(self, *args, **kwargs):
         """
         Create the file object to append to as data is coming in.
         """
         super(TemporaryFileUploadHandler, self).new_file(*args, **kwargs)
-        self.file = ClosedTemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.file = ClosedTemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra,
+                                                temp_dir=self.temp_dir, prefix=self.prefix)
 
     def receive_data_chunk(self, raw_data, start):
         self.file.write(raw_data)
@@ -39,8 +48,8 @@ class ClosedTemporaryUploadedFile(UploadedFile):
     """
     A file uploaded to a temporary location (i.e. stream-to-disk).
     """
-    def __init__(self, name, content_type, size, charset, content_type_extra=None):
-        file = tempfile.NamedTemporaryFile(suffix='.upload', dir=settings.FILE_UPLOAD_TEMP_DIR, delete=False)
+    def __init__(self, name, content_type, size, charset, content_type_extra=None, temp_dir=None, prefix='tmp'):
+        file = tempfile.NamedTemporaryFile(suffix='.upload', prefix=prefix, dir=temp_dir or settings.FILE_UPLOAD_TEMP_DIR, delete=False)
         super(ClosedTemporaryUploadedFile, self).__init__(file, name, content_type, size, charset, content_type_extra)
 
     def temporary_file_path(self):
@@ -256,6 +256,10 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'INFO',
         },
+        'app.scripts': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
         'apscheduler.executors.default': {
             'handlers': ['console'],
             'level': 'WARNING',
@@ -282,6 +286,16 @@ MEDIA_CACHE = os.path.join(MEDIA_ROOT, 'CACHE')
 
 FILE_UPLOAD_TEMP_DIR = MEDIA_TMP
 
+# Where LAS/LAZ conversions are staged. When None, a tmpfs
+# (/dev/shm) is used if it has enough free space, otherwise MEDIA_TMP.
+# Conversions are I/O heavy, so point this to fast local storage (e.g. an NVMe
+# volume) when MEDIA_TMP sits on a slow or network disk
+LAS_TMP_DIR = os.environ.get('WO_LAS_TMP_DIR') or None
+
+# Let nginx send LAS conversion downloads (X-Accel-Redirect) instead of
+# the app server. Requires the /internal-las-convert/ locations from nginx/
+USE_X_ACCEL_REDIRECT = os.environ.get('WO_X_ACCEL_REDIRECT', 'NO') == 'YES'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -239,8 +239,7 @@ def convert_las_to_images_task(self, las_path, output_dir, resolution=0.1, mode=
         logger.info(f"Converting LAS file {las_path} to images")
         
         # Import conversion function
-        from app.api.lasconversion import convert_las_to_images, convert_tifs_to_jpgs
-        import zipfile
+        from app.api.lasconversion import convert_las_to_images, convert_tifs_to_jpgs, open_zip, add_to_zip
         import os
         from pathlib import Path
         
@@ -260,23 +259,28 @@ def convert_las_to_images_task(self, las_path, output_dir, resolution=0.1, mode=
         if not success:
             return {'error': f"Conversion failed: {error}"}
         
-        # Convert TIF to JPG if requested
-        output_files = tif_files
-        if convert_to_jpg:
-            self.update_state(state="PROGRESS", meta={"status": "Converting to JPEG...", "progress": 70})
-            jpg_success, jpg_files, jpg_error = convert_tifs_to_jpgs(tif_dir, jpg_dir)
-            if jpg_success:
-                output_files = jpg_files
-            else:
-                logger.warning(f"TIF to JPG conversion had issues: {jpg_error}")
-        
-        # Create zip file
-        self.update_state(state="PROGRESS", meta={"status": "Creating ZIP archive...", "progress": 90})
         zip_path = os.path.join(output_dir, 'converted_images.zip')
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in output_files:
-                if os.path.exists(file_path):
-                    zipf.write(file_path, os.path.basename(file_path))
+        with open_zip(zip_path) as zipf:
+            # Convert TIF to JPG if requested, adding each JPEG to the
+            # zip file while the remaining ones are still being converted
+            output_files = tif_files
+            zipped = False
+            if convert_to_jpg:
+                self.update_state(state="PROGRESS", meta={"status": "Converting to JPEG...", "progress": 70})
+                jpg_success, jpg_files, jpg_error = convert_tifs_to_jpgs(tif_dir, jpg_dir,
+                                                                         on_converted=lambda f: add_to_zip(zipf, f))
+                if jpg_success:
+                    output_files = jpg_files
+                    zipped = True
+                else:
+                    logger.warning(f"TIF to JPG conversion had issues: {jpg_error}")
+            
+            # Create zip file
+            if not zipped:
+                self.update_state(state="PROGRESS", meta={"status": "Creating ZIP archive...", "progress": 90})
+                for f in output_files:
+                    if os.path.exists(f):
+                        add_to_zip(zipf, f)
         
         self.update_state(state="PROGRESS", meta={"status": "Complete", "progress": 100})
         